@@ -1,10 +1,13 @@
 # Copyright (c) 2025, Yanky and contributors
 # For license information, please see license.txt
 
+import frappe
 from frappe import _, throw, ValidationError
 from frappe.model.document import Document
 import re
 
+from ams.outbox import enqueue_email
+
 class Alumni(Document):
     def before_save(self):
         """Validate email and normalize data"""
@@ -19,17 +22,20 @@ class Alumni(Document):
         self.joined_on = now()
         
     def after_insert(self):
-        """Send welcome email"""
-        from frappe.core.doctype.communication.email import make
-        make(
-            doctype=self.doctype,
-            name=self.name,
-            subject="Welcome to Alumni Network!",
-            content=f"Hi {self.first_name}, welcome aboard!"
-        )
+        """Queue the welcome email (sent by the outbox worker, off the request path)"""
+        enqueue_email("alumni_welcome", self.email, self.doctype, self.name,
+                      {"first_name": self.first_name})
     
     @staticmethod
     def is_valid_email(email):
         """Validate email format"""
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
\ No newline at end of file
+        return re.match(pattern, email) is not None
+
+
+def on_doctype_update():
+    """Composite indexes backing the keyset-paginated directory listings"""
+    frappe.db.add_index("Alumni", ["status", "modified"])
+    frappe.db.add_index("Alumni", ["batch_year", "status", "first_name"])
+    frappe.db.add_index("Alumni", ["course", "status", "batch_year", "first_name"])
+    frappe.db.add_index("Alumni", ["institution", "status", "batch_year", "first_name"])
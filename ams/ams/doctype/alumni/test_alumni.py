@@ -1,9 +1,77 @@
 # Copyright (c) 2025, Yanky and Contributors
 # See license.txt
 
-# import frappe
+import math
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from ams import digest
+from ams.tests.utils import AlumniTestCase
+
+PERIOD = "2026-09-01"
+
+
+class TestAlumniDigest(AlumniTestCase):
+	def setUp(self):
+		super().setUp()
+		self.sendmail = patch("frappe.sendmail").start()
+
+		self.active = self.make_alumni(5)
+		self.inactive = self.make_alumni(1, status="Inactive")
+		frappe.db.commit()
+
+	def tearDown(self):
+		frappe.cache().delete_value(digest.PROGRESS_KEY.format(PERIOD))
+		super().tearDown()
+
+	def sent_to(self):
+		recipients = []
+		for call in self.sendmail.call_args_list:
+			recipients.extend(email for email in call.kwargs["recipients"] if email.startswith(self.prefix))
+		return recipients
+
+	def test_shard_bounds_cover_active_alumni(self):
+		with patch.object(digest, "SHARD_SIZE", 2):
+			bounds = digest.get_shard_bounds()
+
+		self.assertEqual(len(bounds), math.ceil(frappe.db.count("Alumni", {"status": "Active"}) / 2))
+		self.assertEqual(bounds, sorted(bounds))
+		self.assertNotIn(self.inactive[0], bounds)
+
+	def test_shard_sends_once_per_period(self):
+		with patch.object(digest, "CHUNK_SIZE", 2):
+			digest.send_digest_shard(PERIOD, 0, self.prefix, None, "Digest", "<p>Digest</p>")
+			# A retried shard finds everyone stamped and sends nothing again
+			digest.send_digest_shard(PERIOD, 0, self.prefix, None, "Digest", "<p>Digest</p>")
+
+		self.assertEqual(sorted(self.sent_to()), sorted(self.active))
+		self.assertTrue(all(len(call.kwargs["recipients"]) <= 2 for call in self.sendmail.call_args_list))
+		self.assertEqual(
+			set(frappe.get_all("Alumni", filters={"name": ["in", self.active]}, pluck="last_digest_period")),
+			{PERIOD}
+		)
+		self.assertEqual(digest.get_progress(PERIOD)[0]["status"], "Done")
+
+	def test_coordinator_queues_one_job_per_shard(self):
+		with patch.object(digest, "get_period", return_value=PERIOD), patch.object(digest, "SHARD_SIZE", 2):
+			shards = digest.send_monthly_digest()
+			bounds = digest.get_shard_bounds()
+
+		calls = [call for call in self.enqueue.call_args_list if call.args == ("ams.digest.send_digest_shard",)]
+		self.assertEqual(shards, len(bounds))
+		self.assertEqual([call.kwargs["start"] for call in calls], bounds)
+		self.assertEqual([call.kwargs["end"] for call in calls], bounds[1:] + [None])
+		# Rendered once and handed to every shard
+		self.assertEqual(len({call.kwargs["message"] for call in calls}), 1)
+		self.assertEqual({shard["status"] for shard in digest.get_progress(PERIOD).values()}, {"Queued"})
+
 
-class TestAlumni(FrappeTestCase):
-	pass
+class TestDigestPeriod(FrappeTestCase):
+	def test_period_is_the_previous_calendar_month(self):
+		# 30 days before 1 March lands in January after a 28-day February
+		self.assertEqual(digest.get_period("2027-03-01"), "2027-02-01")
+		self.assertEqual(digest.get_period("2028-03-01"), "2028-02-01")
+		self.assertEqual(digest.get_period("2027-03-31"), "2027-02-01")
+		self.assertEqual(digest.get_period("2027-01-01"), "2026-12-01")
@@ -1,9 +1,12 @@
 # Copyright (c) 2025, Yanky and contributors
 # For license information, please see license.txt
 
+import frappe
 from frappe.model.document import Document
 from frappe import throw, ValidationError, _
-from frappe.utils import get_datetime
+from frappe.utils import cint, get_datetime
+
+from ams.reservations import promote_waitlist
 
 class AMSEvent(Document):
     def before_save(self):
@@ -13,7 +16,12 @@ class AMSEvent(Document):
             throw(ValidationError, _("Event date must be in the future"))
     
     def on_update(self):
-        """Update RSVP count"""
-        from frappe.client import get_list
-        rsvp_count = len(get_list("Event RSVP", filters={"event": self.name}))
-        self.db_set("rsvp_count", rsvp_count)
\ No newline at end of file
+        """Fill newly added seats from the waitlist"""
+        before = self.get_doc_before_save()
+        if before and cint(self.max_capacity) != cint(before.max_capacity):
+            promote_waitlist(self.name)
+
+
+def on_doctype_update():
+    """Composite index backing the keyset-paginated upcoming events list"""
+    frappe.db.add_index("AMS Event", ["status", "event_date"])
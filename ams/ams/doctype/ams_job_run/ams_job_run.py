@@ -0,0 +1,15 @@
+# Copyright (c) 2026, Yanky and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class AMSJobRun(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Per-job history and the retention sweep"""
+	frappe.db.add_index("AMS Job Run", ["job", "started_on"])
+	frappe.db.add_index("AMS Job Run", ["started_on"])
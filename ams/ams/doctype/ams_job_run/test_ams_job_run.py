@@ -0,0 +1,91 @@
+# Copyright (c) 2026, Yanky and Contributors
+# See license.txt
+
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from ams.jobs import add_rows, out_of_time, run_job
+
+MODULE = "ams.ams.doctype.ams_job_run.test_ams_job_run"
+
+
+def yielding_task():
+	"""Processes one chunk, then finds its budget spent"""
+	frappe.db.sql("select 1")
+	add_rows(10)
+	time.sleep(0.05)
+	return out_of_time()
+
+
+def finishing_task():
+	frappe.db.sql("select 1")
+	frappe.db.sql("select 2")
+	return 7
+
+
+def failing_task():
+	raise ValueError("boom")
+
+
+def get_last_run(task):
+	return frappe.get_all(
+		"AMS Job Run",
+		filters={"job": task},
+		fields=["status", "rows_processed", "queries", "error"],
+		order_by="creation desc",
+		limit_page_length=1
+	)[0]
+
+
+class TestAMSJobRun(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.delete("AMS Job Run", {"job": ["like", f"{MODULE}.%"]})
+		frappe.db.commit()
+
+	def test_yielded_run_is_continued(self):
+		task = f"{MODULE}.yielding_task"
+		# autospec keeps enqueue's real signature, so a clash with its own
+		# `method` parameter fails here just as it would in a worker
+		with patch("frappe.enqueue", autospec=True) as enqueue:
+			run_job(task, budget=0.01)
+
+		run = get_last_run(task)
+		self.assertEqual(run.status, "Yielded")
+		self.assertEqual(run.rows_processed, 10)
+
+		enqueue.assert_called_once()
+		args, kwargs = enqueue.call_args
+		self.assertEqual(args, ("ams.jobs.run_job",))
+		self.assertEqual(kwargs["task"], task)
+		self.assertEqual(kwargs["budget"], 0.01)
+
+		# The queued continuation is an ordinary call of run_job
+		with patch("frappe.enqueue", autospec=True):
+			frappe.get_attr(args[0])(**{key: kwargs[key] for key in ("task", "budget")})
+		self.assertEqual(get_last_run(task).status, "Yielded")
+
+	def test_finished_run_is_logged_with_counts(self):
+		task = f"{MODULE}.finishing_task"
+		with patch("frappe.enqueue", autospec=True) as enqueue:
+			run_job(task, budget=60)
+
+		run = get_last_run(task)
+		self.assertEqual(run.status, "Success")
+		self.assertEqual(run.rows_processed, 7)
+		# Two selects plus the closing commit
+		self.assertGreaterEqual(run.queries, 2)
+		enqueue.assert_not_called()
+
+	def test_failed_run_is_logged_and_releases_lock(self):
+		task = f"{MODULE}.failing_task"
+		for _ in range(2):
+			with self.assertRaises(ValueError):
+				run_job(task, budget=60)
+
+		# Not "Skipped": the first failure released its lock
+		self.assertEqual(get_last_run(task).status, "Failed")
+		self.assertIn("boom", get_last_run(task).error)
+		self.assertIsNone(getattr(frappe.local, "ams_job", None))
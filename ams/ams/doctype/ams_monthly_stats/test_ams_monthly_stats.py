@@ -0,0 +1,82 @@
+# Copyright (c) 2026, Yanky and Contributors
+# See license.txt
+
+import frappe
+
+from ams.snapshots import get_series, rollup_months
+from ams.tests.utils import AlumniTestCase
+
+# Months far enough back that no other test data falls in them
+JANUARY, FEBRUARY, MARCH = "2001-01-01", "2001-02-01", "2001-03-01"
+
+
+def make_donation(amount, donation_date, status="Completed"):
+	return frappe.get_doc({
+		"doctype": "Donation",
+		"donor_name": "Snapshot Donor",
+		"donor_email": "snapshot-donor@example.com",
+		"amount": amount,
+		"payment_method": "UPI",
+		"donation_date": donation_date,
+		"status": status
+	}).insert(ignore_permissions=True).name
+
+
+class TestAMSMonthlyStats(AlumniTestCase):
+	def setUp(self):
+		super().setUp()
+		self.alumni = self.make_alumni(2, batch_year=2000)
+		for name in self.alumni:
+			frappe.db.set_value("Alumni", name, "joined_on", "2001-01-10 09:00:00")
+
+		self.post = frappe.get_doc({
+			"doctype": "Wall Post",
+			"title": f"{self.prefix}post",
+			"alumni": self.alumni[0],
+			"content": "Snapshot",
+			"status": "Published",
+			"published_on": "2001-01-20 09:00:00"
+		}).insert(ignore_permissions=True).name
+
+		self.donations = [
+			make_donation(100, "2001-01-05"),
+			make_donation(250, "2001-01-25"),
+			make_donation(999, "2001-01-26", status="Failed"),
+			make_donation(40, "2001-02-14")
+		]
+
+	def tearDown(self):
+		frappe.db.delete("AMS Monthly Stats", {"period": ["between", [JANUARY, MARCH]]})
+		frappe.db.delete("Donation", {"name": ["in", self.donations]})
+		frappe.db.delete("Wall Post", {"name": self.post})
+		frappe.db.delete("AMS Outbox", {"reference_name": ["in", self.donations]})
+		super().tearDown()
+
+	def test_rollup_stores_one_row_per_month(self):
+		months = rollup_months(JANUARY, MARCH)
+
+		self.assertEqual(list(months), [JANUARY, FEBRUARY])
+		january = frappe.get_doc("AMS Monthly Stats", JANUARY)
+		self.assertEqual(january.new_alumni, 2)
+		self.assertEqual(january.new_posts, 1)
+		# Failed donations are not counted
+		self.assertEqual(january.total_donations, 350)
+		self.assertEqual(january.donation_count, 2)
+		self.assertEqual(frappe.db.get_value("AMS Monthly Stats", FEBRUARY, "total_donations"), 40)
+
+	def test_rerun_updates_in_place(self):
+		rollup_months(JANUARY, MARCH)
+		self.donations.append(make_donation(60, "2001-02-20"))
+		rollup_months(JANUARY, MARCH)
+
+		self.assertEqual(frappe.db.count("AMS Monthly Stats", {"period": ["between", [JANUARY, FEBRUARY]]}), 2)
+		self.assertEqual(frappe.db.get_value("AMS Monthly Stats", FEBRUARY, "total_donations"), 100)
+		self.assertEqual(frappe.db.get_value("AMS Monthly Stats", FEBRUARY, "donation_count"), 2)
+
+	def test_series_reads_stored_months(self):
+		rollup_months(JANUARY, MARCH)
+		series = get_series(JANUARY, FEBRUARY)
+
+		self.assertEqual(series["periods"], [JANUARY, FEBRUARY])
+		self.assertEqual(series["new_alumni"], [2, 0])
+		self.assertEqual(series["donation_count"], [2, 1])
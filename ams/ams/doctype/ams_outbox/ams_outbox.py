@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Yanky and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class AMSOutbox(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Queue scan for the outbox worker"""
+	frappe.db.add_index("AMS Outbox", ["status", "creation"])
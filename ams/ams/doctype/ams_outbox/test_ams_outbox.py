@@ -0,0 +1,111 @@
+# Copyright (c) 2026, Yanky and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from ams.outbox import MAX_ATTEMPTS, enqueue_email, process_outbox
+
+
+def make_recipient():
+	return f"outbox-test-{frappe.generate_hash(length=10)}@example.com"
+
+
+def get_rows(recipient):
+	return frappe.get_all(
+		"AMS Outbox",
+		filters={"recipient": recipient},
+		fields=["name", "status", "attempts", "error", "reference_name"],
+		order_by="creation asc, name asc"
+	)
+
+
+class TestAMSOutbox(FrappeTestCase):
+	def setUp(self):
+		# The after-commit kick would run the worker outside the test
+		self.enqueue = patch("frappe.enqueue").start()
+		self.sendmail = patch("frappe.sendmail").start()
+		self.addCleanup(patch.stopall)
+		self.recipients = []
+
+	def tearDown(self):
+		frappe.db.delete("AMS Outbox", {"recipient": ["in", self.recipients or [""]]})
+		frappe.db.delete("User", {"name": ["in", self.recipients or [""]]})
+		frappe.db.commit()
+
+	def queue(self, template="donation_receipt", reference_name=None, recipient=None, context=None):
+		recipient = recipient or make_recipient()
+		if recipient not in self.recipients:
+			self.recipients.append(recipient)
+		enqueue_email(template, recipient, "Donation", reference_name or frappe.generate_hash(length=10),
+					  context or {"donor_name": "Jane", "amount": 500})
+		frappe.db.commit()
+		return recipient
+
+	def test_same_email_is_queued_once(self):
+		recipient = self.queue(reference_name="DON-0001")
+		self.queue(reference_name="DON-0001", recipient=recipient)
+
+		self.assertEqual(len(get_rows(recipient)), 1)
+		self.enqueue.assert_called_once()
+
+	def test_long_recipient_is_not_truncated_silently(self):
+		recipient = "x" * 200 + "@example.com"
+		self.recipients.append(recipient)
+		with self.assertRaises(Exception):
+			enqueue_email("donation_receipt", recipient, "Donation", "DON-0002", {})
+		frappe.db.rollback()
+
+	def test_sent_rows_are_marked(self):
+		recipient = self.queue()
+		process_outbox()
+
+		self.sendmail.assert_called_once()
+		self.assertEqual(self.sendmail.call_args.kwargs["recipients"], [recipient])
+		self.assertIn("₹500", self.sendmail.call_args.kwargs["subject"])
+		self.assertEqual(get_rows(recipient)[0].status, "Sent")
+
+	def test_identical_receipts_for_different_donations_are_all_sent(self):
+		recipient = self.queue(reference_name="DON-0001")
+		self.queue(reference_name="DON-0002", recipient=recipient)
+		process_outbox()
+
+		self.assertEqual(self.sendmail.call_count, 2)
+		self.assertEqual(
+			sorted(call.kwargs["reference_name"] for call in self.sendmail.call_args_list),
+			["DON-0001", "DON-0002"]
+		)
+		self.assertEqual([row.status for row in get_rows(recipient)], ["Sent", "Sent"])
+
+	def test_failures_are_retried_until_failed(self):
+		self.sendmail.side_effect = Exception("SMTP down")
+		recipient = self.queue()
+
+		for attempt in range(1, MAX_ATTEMPTS + 1):
+			# Each run tries a failed row once, not in a loop
+			process_outbox()
+			row = get_rows(recipient)[0]
+			self.assertEqual(row.attempts, attempt)
+			self.assertEqual(row.status, "Failed" if attempt == MAX_ATTEMPTS else "Queued")
+
+		self.assertIn("SMTP down", row.error)
+		process_outbox()
+		self.assertEqual(get_rows(recipient)[0].attempts, MAX_ATTEMPTS)
+
+	def test_welcome_carries_a_setup_link(self):
+		recipient = make_recipient()
+		frappe.get_doc({
+			"doctype": "User",
+			"email": recipient,
+			"first_name": "Welcome",
+			"send_welcome_email": 0
+		}).insert(ignore_permissions=True)
+		self.queue("alumni_welcome", recipient=recipient, context={"first_name": "Welcome"})
+
+		process_outbox()
+
+		message = self.sendmail.call_args.kwargs["message"]
+		self.assertIn("Hi Welcome", message)
+		self.assertIn("/update-password?key=", message)
@@ -5,6 +5,8 @@
 from frappe.model.document import Document
 from frappe import throw, ValidationError, _
 
+from ams.outbox import enqueue_email
+
 class Donation(Document):
     def before_save(self):
         """Validate donation amount"""
@@ -16,11 +18,6 @@ class Donation(Document):
         self.send_receipt_email()
     
     def send_receipt_email(self):
-        """Generate and send donation receipt"""
-        from frappe.core.doctype.communication.email import make
-        make(
-            doctype=self.doctype,
-            name=self.name,
-            subject=f"Donation Receipt - ₹{self.amount}",
-            content=f"Thank you for your donation of ₹{self.amount}. Receipt attached."
-        )
\ No newline at end of file
+        """Queue the donation receipt (sent by the outbox worker, off the request path)"""
+        enqueue_email("donation_receipt", self.donor_email, self.doctype, self.name,
+                      {"donor_name": self.donor_name, "amount": self.amount})
\ No newline at end of file
@@ -5,20 +5,35 @@ import frappe
 from frappe.model.document import Document
 from frappe import throw, ValidationError, _
 
+from ams.counters import apply_rsvp_change
+from ams.reservations import promote_waitlist, released_seats, reserve_seats
+
 class EventRSVP(Document):
     def before_save(self):
-        """Check event capacity"""
-        event = frappe.get_doc("AMS Event", self.event)
-        if event.max_capacity:
-            existing_rsvps = frappe.db.count(
-                "Event RSVP",
-                filters={"event": self.event, "response_status": "Going"}
-            )
-            if existing_rsvps >= event.max_capacity:
-                throw(ValidationError, _("Event is at full capacity"))
+        """Claim seats (including guests) or join the waitlist"""
+        reserve_seats(self)
     
-    def after_insert(self):
-        """Trigger event update"""
+    def before_insert(self):
+        """Set RSVP timestamp"""
         from frappe.utils import now
-        self.db_set("rsvp_date", now())
-        frappe.get_doc("AMS Event", self.event).save()
\ No newline at end of file
+        self.rsvp_date = now()
+    
+    def on_update(self):
+        """Keep the event's per-status counters in step with this RSVP"""
+        before = self.get_doc_before_save()
+        apply_rsvp_change(before, self)
+        
+        if released_seats(before, self):
+            promote_waitlist(before.event)
+    
+    def on_trash(self):
+        """Remove this RSVP from the event's counters"""
+        apply_rsvp_change(self, None)
+        
+        if released_seats(self, None):
+            promote_waitlist(self.event)
+
+
+def on_doctype_update():
+    """Index backing the ordered waitlist scan"""
+    frappe.db.add_index("Event RSVP", ["event", "response_status", "waitlisted_on"])
@@ -1,9 +1,120 @@
 # Copyright (c) 2025, Yanky and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+from concurrent.futures import ThreadPoolExecutor
 
+import frappe
+from frappe.utils import add_to_date, cint
 
-class TestEventRSVP(FrappeTestCase):
-	pass
+from ams.tests.utils import AlumniTestCase
+
+CAPACITY = 50
+ATTENDEES = 200
+WORKERS = 20
+
+
+def make_event(max_capacity):
+	return frappe.get_doc({
+		"doctype": "AMS Event",
+		"event_name": f"Capacity Test {frappe.generate_hash(length=8)}",
+		"event_date": add_to_date(None, days=7, as_string=True, as_datetime=True),
+		"max_capacity": max_capacity
+	}).insert(ignore_permissions=True)
+
+
+def insert_rsvp(site, event, alumni, guests):
+	"""Runs in a worker thread with its own connection, like a separate request"""
+	frappe.init(site=site)
+	frappe.connect()
+	try:
+		frappe.set_user("Administrator")
+		rsvp = frappe.get_doc({
+			"doctype": "Event RSVP",
+			"event": event,
+			"alumni": alumni,
+			"response_status": "Going",
+			"guests": guests
+		}).insert()
+		frappe.db.commit()
+		return rsvp.response_status
+	finally:
+		frappe.destroy()
+
+
+class TestEventRSVP(AlumniTestCase):
+	def setUp(self):
+		super().setUp()
+		self.event = make_event(CAPACITY)
+		self.alumni = self.make_alumni(ATTENDEES)
+		# Worker connections only see committed rows
+		frappe.db.commit()
+
+	def tearDown(self):
+		frappe.db.delete("Event RSVP", {"event": self.event.name})
+		frappe.db.delete("AMS Event", {"name": self.event.name})
+		super().tearDown()
+
+	def get_seat_counts(self):
+		event = frappe.db.get_value(
+			"AMS Event",
+			self.event.name,
+			["going_count", "guest_count", "waitlist_count"],
+			as_dict=True
+		)
+		rows = frappe.get_all(
+			"Event RSVP",
+			filters={"event": self.event.name},
+			fields=["response_status", "guests"]
+		)
+		return event, rows
+
+	def test_concurrent_rsvps_never_overbook(self):
+		site = frappe.local.site
+		with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+			statuses = list(pool.map(
+				lambda args: insert_rsvp(site, *args),
+				[(self.event.name, alumni, i % 3) for i, alumni in enumerate(self.alumni)]
+			))
+
+		event, rows = self.get_seat_counts()
+		going = [row for row in rows if row.response_status == "Going"]
+		seats = sum(1 + cint(row.guests) for row in going)
+
+		self.assertEqual(len(rows), ATTENDEES)
+		self.assertLessEqual(seats, CAPACITY)
+		# At most one max-size party (3 seats) can be left unseated by strict FIFO
+		self.assertGreater(seats, CAPACITY - 3)
+
+		# Counters agree with the rows they summarize
+		self.assertEqual(event.going_count, len(going))
+		self.assertEqual(event.going_count + event.guest_count, seats)
+		self.assertEqual(event.waitlist_count, statuses.count("Waitlisted"))
+		self.assertEqual(event.waitlist_count, ATTENDEES - len(going))
+
+	def test_cancellation_promotes_waitlist_in_order(self):
+		frappe.db.set_value("AMS Event", self.event.name, "max_capacity", 2)
+
+		rsvps = []
+		for alumni in self.alumni[:4]:
+			rsvps.append(frappe.get_doc({
+				"doctype": "Event RSVP",
+				"event": self.event.name,
+				"alumni": alumni,
+				"response_status": "Going"
+			}).insert())
+
+		self.assertEqual(
+			[rsvp.response_status for rsvp in rsvps],
+			["Going", "Going", "Waitlisted", "Waitlisted"]
+		)
+
+		rsvps[0].reload()
+		rsvps[0].response_status = "Not Going"
+		rsvps[0].save()
+
+		self.assertEqual(frappe.db.get_value("Event RSVP", rsvps[2].name, "response_status"), "Going")
+		self.assertEqual(frappe.db.get_value("Event RSVP", rsvps[3].name, "response_status"), "Waitlisted")
+
+		event, rows = self.get_seat_counts()
+		self.assertEqual(event.going_count, 2)
+		self.assertEqual(event.waitlist_count, 1)
@@ -1,9 +1,15 @@
 # Copyright (c) 2025, Yanky and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.utils.nestedset import NestedSet
 
 
 class Institution(NestedSet):
 	pass
+
+
+def on_doctype_update():
+	"""Indexes backing the keyset-paginated list and lft/rgt subtree range scans"""
+	frappe.db.add_index("Institution", ["status", "institution_name"])
+	frappe.db.add_index("Institution", ["lft", "rgt"])
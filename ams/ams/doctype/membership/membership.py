@@ -1,7 +1,7 @@
 # Copyright (c) 2025, Yanky and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 from frappe.utils import now, add_days
 from frappe import _
@@ -20,4 +20,9 @@ class Membership(Document):
         """Check and update expired memberships"""
         from frappe.utils import today
         if self.expiry_date and self.expiry_date < today() and self.status == "Active":
-            self.db_set("status", "Expired")
\ No newline at end of file
+            self.db_set("status", "Expired")
+
+
+def on_doctype_update():
+    """Index backing the nightly expiry sweep"""
+    frappe.db.add_index("Membership", ["status", "expiry_date"])
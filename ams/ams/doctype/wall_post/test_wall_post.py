@@ -1,9 +1,96 @@
 # Copyright (c) 2025, Yanky and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+from unittest.mock import patch
 
+import frappe
+from frappe.utils import add_days, now
 
-class TestWallPost(FrappeTestCase):
-	pass
+from ams.retention import candidate_query, count_candidates, get_policies, purge, run_retention
+from ams.tests.utils import AlumniTestCase
+
+
+class TestWallPostRetention(AlumniTestCase):
+	def setUp(self):
+		super().setUp()
+		self.alumni = self.make_alumni(3)
+
+		self.stale = self.make_post("stale", "Archived", add_days(now(), -400))
+		self.recent = self.make_post("recent", "Archived", add_days(now(), -30))
+		self.published = self.make_post("published", "Published", add_days(now(), -400))
+
+		for alumni in self.alumni[:2]:
+			frappe.get_doc({"doctype": "Wall Post Like", "post": self.stale, "alumni": alumni}).insert(
+				ignore_permissions=True
+			)
+
+		# A like left behind by a post deleted without its hooks
+		self.orphan = frappe.generate_hash(length=10)
+		frappe.db.sql(
+			"""insert into `tabWall Post Like` (name, creation, modified, post, alumni)
+			values (%s, %s, %s, %s, %s)""",
+			(self.orphan, now(), now(), f"{self.prefix}gone", self.alumni[2])
+		)
+		frappe.db.commit()
+
+	def tearDown(self):
+		frappe.db.delete("Wall Post Like", {"alumni": ["in", self.alumni]})
+		frappe.db.delete("Wall Post", {"name": ["like", f"{self.prefix}%"]})
+		super().tearDown()
+
+	def make_post(self, suffix, status, published_on):
+		name = frappe.get_doc({
+			"doctype": "Wall Post",
+			"title": f"{self.prefix}{suffix}",
+			"alumni": self.alumni[0],
+			"content": "Retention",
+			"status": "Draft"
+		}).insert(ignore_permissions=True).name
+		# Set directly: saving would stamp published_on and fan the post out
+		frappe.db.set_value("Wall Post", name, {"status": status, "published_on": published_on})
+		return name
+
+	def test_policy_selects_only_stale_archived_posts(self):
+		candidates = candidate_query("Wall Post", get_policies()["Wall Post"]).run(pluck=True)
+
+		self.assertIn(self.stale, candidates)
+		self.assertNotIn(self.recent, candidates)
+		self.assertNotIn(self.published, candidates)
+
+	def test_dry_run_counts_without_deleting(self):
+		counts = count_candidates("Wall Post", get_policies()["Wall Post"])
+		report = run_retention(dry_run=True, doctypes=["Wall Post", "Wall Post Like"])
+
+		self.assertGreaterEqual(counts["Wall Post"], 1)
+		self.assertGreaterEqual(counts["Wall Post Like"], 2)
+		self.assertEqual(report["Wall Post"], counts)
+		self.assertTrue(frappe.db.exists("Wall Post", self.stale))
+		self.assertTrue(frappe.db.exists("Wall Post Like", self.orphan))
+
+	def test_purge_removes_posts_with_their_likes_in_chunks(self):
+		with patch("time.sleep") as sleep:
+			deleted = purge("Wall Post", get_policies()["Wall Post"], chunk_size=1, pause=0.5)
+
+		self.assertGreaterEqual(deleted["Wall Post"], 1)
+		self.assertGreaterEqual(deleted["Wall Post Like"], 2)
+		# Paused between full chunks
+		self.assertEqual(sleep.call_count, deleted["Wall Post"])
+		self.assertFalse(frappe.db.exists("Wall Post", self.stale))
+		self.assertFalse(frappe.db.exists("Wall Post Like", {"post": self.stale}))
+		self.assertTrue(frappe.db.exists("Wall Post", self.recent))
+		self.assertTrue(frappe.db.exists("Wall Post", self.published))
+
+	def test_orphaned_likes_are_purged(self):
+		deleted = purge("Wall Post Like", get_policies()["Wall Post Like"], pause=0)
+
+		self.assertGreaterEqual(deleted["Wall Post Like"], 1)
+		self.assertFalse(frappe.db.exists("Wall Post Like", self.orphan))
+		self.assertEqual(frappe.db.count("Wall Post Like", {"post": self.stale}), 2)
+
+	def test_site_config_overrides_policies(self):
+		with patch.dict(frappe.conf, {"ams_retention_policies": {"Wall Post": {"days": 10}, "Donation": None}}):
+			policies = get_policies()
+
+		self.assertEqual(policies["Wall Post"]["days"], 10)
+		self.assertEqual(policies["Wall Post"]["children"], [("Wall Post Like", "post")])
+		self.assertIsNone(policies["Donation"])
@@ -5,12 +5,37 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import now
 
+from ams.timelines import fan_out, withdraw
+
 class WallPost(Document):
     def before_save(self):
         """Auto-set published_on when status changes to Published"""
         if self.status == "Published" and not self.published_on:
             self.published_on = now()
+        
+        # Timelines are only written when the post enters or leaves Published
+        was_published = not self.is_new() and self.get_db_value("status") == "Published"
+        self.flags.publish_changed = was_published != (self.status == "Published")
+    
+    def on_update(self):
+        """Fan the post out to (or withdraw it from) its audience timelines"""
+        if not self.flags.publish_changed:
+            return
+
+        if self.status == "Published":
+            fan_out(self)
+        else:
+            withdraw(self)
     
     def on_trash(self):
-        """Clean up associated likes"""
-        frappe.db.delete("Wall Post Like", {"wall_post": self.name})
\ No newline at end of file
+        """Clean up associated likes (one set-based delete, no per-like hooks)"""
+        frappe.db.delete("Wall Post Like", {"post": self.name})
+        if self.status == "Published":
+            withdraw(self)
+
+
+def on_doctype_update():
+    """Composite indexes backing the keyset-paginated feed"""
+    frappe.db.add_index("Wall Post", ["status", "published_on"])
+    frappe.db.add_index("Wall Post", ["status", "likes_count"])
+    frappe.db.add_index("Wall Post", ["status", "trending_score"])
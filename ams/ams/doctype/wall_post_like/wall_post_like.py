@@ -5,21 +5,25 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import now
 
+from ams.counters import decrement_likes, increment_likes
+from ams.trending import refresh_scores
+
 class WallPostLike(Document):
     def before_insert(self):
-        """Set liked_on timestamp and enforce uniqueness"""
+        """Set liked_on timestamp (uniqueness is enforced by the (post, alumni) constraint)"""
         self.liked_on = now()
-        
-        # Check if already liked
-        existing = frappe.db.get_value(
-            "Wall Post Like",
-            {"post": self.post, "alumni": self.alumni}
-        )
-        if existing:
-            frappe.throw(frappe._("You have already liked this post"))
+    
+    def after_insert(self):
+        """Atomically bump the post's likes count and trending score"""
+        increment_likes(self.post)
+        refresh_scores([self.post])
     
     def on_trash(self):
         """Update wall post likes count when like is deleted"""
-        post = frappe.get_doc("Wall Post", self.post)
-        post.likes_count = max(0, (post.likes_count or 1) - 1)
-        post.save()
\ No newline at end of file
+        decrement_likes(self.post)
+        refresh_scores([self.post])
+
+
+def on_doctype_update():
+    """One like per alumni per post"""
+    frappe.db.add_unique("Wall Post Like", ["post", "alumni"], constraint_name="unique_post_alumni")
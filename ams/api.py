@@ -5,6 +5,22 @@ from frappe.exceptions import ValidationError
 import json
 import re
 
+from ams import search
+from ams.conditional import conditional_get
+from ams.error_sink import caller_name, record_error
+from ams.fieldsets import InvalidFieldsError, parse_fields, pick, source_columns, trim
+from ams.identity import get_alumni_for_user, get_current_alumni
+from ams.institutions import count_alumni_in_subtree, get_rollup, get_tree, subtree_condition
+from ams.loaders import event_loader, get_authors
+from ams.memberships import effective_status
+from ams.pagination import get_page
+from ams.profiles import get_cache_stats, get_profile
+from ams.rate_limit import get_metrics as get_rate_limit_counts, rate_limited
+from ams.reservations import EventCapacityError, get_waitlist_position
+from ams.snapshots import get_series
+from ams.stats import get_stats
+from ams.timelines import get_timeline
+
 # ============== RESPONSE HELPERS ==============
 
 def success_response(data=None, message="Success", status_code=200):
@@ -18,7 +34,8 @@ def success_response(data=None, message="Success", status_code=200):
 
 def error_response(message="Error", error_code="UNKNOWN_ERROR", status_code=400):
     """Standardized error response"""
-    frappe.log_error(title=error_code, message=message)
+    # Buffered, deduplicated and flushed in bulk; most 4xx errors are sampled out
+    record_error(error_code, message, method=caller_name(), status_code=status_code)
     return {
         "success": False,
         "message": message,
@@ -26,23 +43,10 @@ def error_response(message="Error", error_code="UNKNOWN_ERROR", status_code=400)
         "status": status_code
     }
 
-def paginate(items, page=1, page_size=20):
-    """Helper to paginate results"""
-    page = max(1, cint(page))
-    page_size = min(cint(page_size), 100)  # Max 100 per page
-    start = (page - 1) * page_size
-    end = start + page_size
-    
-    return {
-        "items": items[start:end],
-        "page": page,
-        "page_size": page_size,
-        "total": len(items)
-    }
-
 # ============== AUTH ENDPOINTS ==============
 
 @frappe.whitelist(allow_guest=True)
+@rate_limited("register_alumni", email_arg="email")
 def register_alumni(email, first_name, last_name, institution, batch_year, phone=None, course=None):
     """Register new alumni (creates both User & Alumni records)"""
     try:
@@ -64,7 +68,8 @@ def register_alumni(email, first_name, last_name, institution, batch_year, phone
             "email": email,
             "first_name": first_name,
             "last_name": last_name,
-            "send_welcome_email": 1,
+            # The Alumni welcome email (via the outbox) carries the password setup link
+            "send_welcome_email": 0,
             "roles": [{"role": "Alumni"}]  # Assign Alumni role
         })
         user.insert(ignore_permissions=True)
@@ -100,6 +105,7 @@ def register_alumni(email, first_name, last_name, institution, batch_year, phone
         return error_response(str(e), "REGISTRATION_ERROR", 500)
 
 @frappe.whitelist(allow_guest=True)
+@rate_limited("login", email_arg="email")
 def login(email, password):
     """Authenticate user via email & password"""
     try:
@@ -111,7 +117,7 @@ def login(email, password):
         login_manager.post_login()
         
         # Get alumni info
-        alumni_id = frappe.db.get_value("Alumni", {"email": email}, "name")
+        alumni_id = get_alumni_for_user(frappe.session.user)
         user = frappe.get_doc("User", email)
         
         return success_response(
@@ -130,37 +136,23 @@ def login(email, password):
     except Exception as e:
         return error_response(str(e), "AUTH_ERROR", 500)
 
+# Fields a client may ask for through `fields` (sparse fieldsets)
+CURRENT_USER_FIELDS = ["first_name", "last_name", "email", "phone", "institution", "batch_year", "course",
+                       "job_title", "company", "bio", "profile_picture", "linkedin_url", "location", "status"]
+
 @frappe.whitelist()
-def get_current_user():
+def get_current_user(fields=None):
     """Get current logged-in user's profile"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, [
-            "name", "first_name", "last_name", "email", "phone", "institution",
-            "batch_year", "course", "job_title", "company", "bio",
-            "profile_picture", "linkedin_url", "location", "status"
-        ])
+        fields = parse_fields(fields, CURRENT_USER_FIELDS, required=("id",))
+        alumni = get_current_alumni()
         
         if not alumni:
             return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
         
-        return success_response({
-            "id": alumni[0],
-            "first_name": alumni[1],
-            "last_name": alumni[2],
-            "email": alumni[3],
-            "phone": alumni[4],
-            "institution": alumni[5],
-            "batch_year": alumni[6],
-            "course": alumni[7],
-            "job_title": alumni[8],
-            "company": alumni[9],
-            "bio": alumni[10],
-            "profile_picture": alumni[11],
-            "linkedin_url": alumni[12],
-            "location": alumni[13],
-            "status": alumni[14]
-        })
+        return success_response(pick(get_profile(alumni), fields))
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "USER_FETCH_ERROR", 500)
 
@@ -175,64 +167,55 @@ def logout():
 
 # ============== ALUMNI ENDPOINTS ==============
 
+# Fields a client may ask for through `fields` (sparse fieldsets)
+PROFILE_FIELDS = ["first_name", "last_name", "email", "phone", "institution", "batch_year", "course",
+                  "job_title", "company", "bio", "profile_picture", "linkedin_url", "location", "status",
+                  "joined_on", "posts_count", "membership"]
+BATCH_LIST_FIELDS = ["first_name", "last_name", "job_title", "company", "profile_picture", "location"]
+COURSE_LIST_FIELDS = ["first_name", "last_name", "institution", "batch_year", "job_title", "company",
+                      "profile_picture"]
+
 @frappe.whitelist()
-def get_alumni_profile(alumni_id):
+# The body carries a date-dependent membership status, so the ETag also
+# rolls over hourly rather than waiting for the nightly expiry sweep
+@conditional_get(lambda kwargs: [f"Alumni:{kwargs.get('alumni_id')}"], ttl=3600)
+def get_alumni_profile(alumni_id, fields=None):
     """Get detailed alumni profile by ID or email"""
     try:
-        alumni = frappe.get_doc("Alumni", alumni_id)
-        
-        # Get posts count
-        posts_count = frappe.db.count("Wall Post", {"alumni": alumni.name, "status": "Published"})
-        
-        # Get membership status
-        membership = frappe.db.get_value("Membership", {"alumni": alumni.name}, 
-                                        ["membership_type", "status", "expiry_date"])
-        
-        return success_response({
-            "id": alumni.name,
-            "first_name": alumni.first_name,
-            "last_name": alumni.last_name,
-            "email": alumni.email,
-            "phone": alumni.phone,
-            "institution": alumni.institution,
-            "batch_year": alumni.batch_year,
-            "course": alumni.course,
-            "job_title": alumni.job_title,
-            "company": alumni.company,
-            "bio": alumni.bio,
-            "profile_picture": alumni.profile_picture,
-            "linkedin_url": alumni.linkedin_url,
-            "location": alumni.location,
-            "status": alumni.status,
-            "joined_on": alumni.joined_on,
-            "posts_count": posts_count,
-            "membership": {
-                "type": membership[0] if membership else None,
-                "status": membership[1] if membership else None,
-                "expiry_date": membership[2] if membership else None
-            } if membership else None
-        })
+        fields = parse_fields(fields, PROFILE_FIELDS, required=("id",))
+        return success_response(pick(get_profile(alumni_id), fields))
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except frappe.DoesNotExistError:
         return error_response("Alumni not found", "ALUMNI_NOT_FOUND", 404)
     except Exception as e:
         return error_response(str(e), "PROFILE_FETCH_ERROR", 500)
 
 @frappe.whitelist()
-def search_alumni(query="", batch_year=None, institution=None, course=None, company=None, page=1, page_size=20):
+def search_alumni(query="", batch_year=None, institution=None, course=None, company=None, page=1, page_size=20,
+                  cursor=None, fields=None):
     """Advanced alumni search with filters"""
     try:
-        filters = []
+        fields = parse_fields(fields, search.RESPONSE_FIELDS)
         
         if query:
-            filters.append([
-                ["Alumni", "first_name", "like", f"%{query}%"],
-                "or",
-                ["Alumni", "last_name", "like", f"%{query}%"],
-                "or",
-                ["Alumni", "company", "like", f"%{query}%"],
-                "or",
-                ["Alumni", "job_title", "like", f"%{query}%"]
-            ])
+            # Free-text queries go through the relevance-ranked full-text index
+            results = search.search(
+                query,
+                filters={
+                    "institution": institution,
+                    "batch_year": cint(batch_year) if batch_year else None,
+                    "course": course,
+                    "company": company
+                },
+                page=page,
+                page_size=page_size,
+                fields=fields,
+                cursor=cursor
+            )
+            return success_response(results)
+        
+        filters = [["Alumni", "status", "=", "Active"]]
         
         if institution:
             filters.append(["Alumni", "institution", "=", institution])
@@ -243,69 +226,92 @@ def search_alumni(query="", batch_year=None, institution=None, course=None, comp
         if company:
             filters.append(["Alumni", "company", "like", f"%{company}%"])
         
-        filters.append(["Alumni", "status", "=", "Active"])
-        
-        results = frappe.db.get_list(
+        paginated = get_page(
             "Alumni",
             filters=filters,
-            fields=["name", "first_name", "last_name", "institution", "batch_year", "job_title", 
-                   "company", "profile_picture", "location"],
-            order_by="modified desc"
+            # Without a query there is nothing to rank by
+            fields=[field for field in fields if field != "relevance"],
+            order_by="modified desc",
+            page=page,
+            page_size=page_size,
+            cursor=cursor
         )
         
-        paginated = paginate(results, page, page_size)
         return success_response(paginated)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "SEARCH_ERROR", 500)
 
 @frappe.whitelist()
-def get_alumni_by_batch(batch_year, page=1, page_size=20):
+def get_alumni_by_batch(batch_year, page=1, page_size=20, cursor=None, fields=None):
     """Get all alumni from a specific batch"""
     try:
-        results = frappe.db.get_list(
+        paginated = get_page(
             "Alumni",
             filters={"batch_year": cint(batch_year), "status": "Active"},
-            fields=["name", "first_name", "last_name", "job_title", "company", 
-                   "profile_picture", "location"],
-            order_by="first_name asc"
+            fields=parse_fields(fields, BATCH_LIST_FIELDS),
+            order_by="first_name asc",
+            page=page,
+            page_size=page_size,
+            cursor=cursor
         )
-        
-        paginated = paginate(results, page, page_size)
+
         return success_response(paginated)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "BATCH_FETCH_ERROR", 500)
 
 @frappe.whitelist()
-def get_alumni_by_course(course, page=1, page_size=20):
+def get_alumni_by_course(course, page=1, page_size=20, cursor=None, fields=None):
     """Get all alumni from a specific course"""
     try:
-        results = frappe.db.get_list(
+        paginated = get_page(
             "Alumni",
             filters={"course": course, "status": "Active"},
-            fields=["name", "first_name", "last_name", "institution", "batch_year", "job_title", 
-                   "company", "profile_picture"],
-            order_by="batch_year desc, first_name asc"
+            fields=parse_fields(fields, COURSE_LIST_FIELDS),
+            order_by="batch_year desc, first_name asc",
+            page=page,
+            page_size=page_size,
+            cursor=cursor
         )
-        
-        paginated = paginate(results, page, page_size)
+
         return success_response(paginated)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "COURSE_FETCH_ERROR", 500)
 
 @frappe.whitelist()
-def get_alumni_by_institution(institution, page=1, page_size=20):
-    """Get all alumni from a specific course"""
+def get_alumni_by_institution(institution, page=1, page_size=20, cursor=None, include_children=0, fields=None):
+    """Get all alumni from a specific institution (optionally its whole subtree)"""
     try:
-        results = frappe.db.get_list(
+        filters = {"status": "Active"}
+        extra_conditions = None
+        
+        if cint(include_children):
+            # One lft/rgt range sub-query instead of a call per child institution
+            extra_conditions = [subtree_condition(institution)]
+        else:
+            filters["institution"] = institution
+        
+        paginated = get_page(
             "Alumni",
-            filters={"institution": institution, "status": "Active"},
-            fields=["name", "first_name", "last_name", "institution", "batch_year", "job_title", 
-                   "company", "profile_picture"],
-            order_by="batch_year desc, first_name asc"
+            filters=filters,
+            extra_conditions=extra_conditions,
+            fields=parse_fields(fields, COURSE_LIST_FIELDS),
+            order_by="batch_year desc, first_name asc",
+            page=page,
+            page_size=page_size,
+            cursor=cursor
         )
-        
-        paginated = paginate(results, page, page_size)
+
         return success_response(paginated)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
+    except frappe.DoesNotExistError:
+        return error_response("Institution not found", "INSTITUTION_NOT_FOUND", 404)
     except Exception as e:
         return error_response(str(e), "INSTITUTION_FETCH_ERROR", 500)
 
@@ -314,8 +320,11 @@ def update_alumni_profile(first_name=None, last_name=None, phone=None, bio=None,
                          job_title=None, company=None, linkedin_url=None, location=None):
     """Update current user's alumni profile"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.get_doc("Alumni", {"email": current_user})
+        alumni_id = get_current_alumni()
+        if not alumni_id:
+            return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
+        
+        alumni = frappe.get_doc("Alumni", alumni_id)
         
         if first_name:
             alumni.first_name = first_name
@@ -343,34 +352,71 @@ def update_alumni_profile(first_name=None, last_name=None, phone=None, bio=None,
 
 # ============== WALL POST ENDPOINTS ==============
 
+FEED_FIELDS = ["title", "content", "alumni", "featured_image", "likes_count", "trending_score", "published_on",
+               "author"]
+POST_FIELDS = ["title", "content", "featured_image", "likes_count", "status", "published_on", "author"]
+
+# Computed response keys -> the columns they are built from
+POST_SOURCES = {"id": ["name"], "author": ["alumni"]}
+
 @frappe.whitelist()
-def get_feed(page=1, page_size=20, sort_by="latest"):
+@conditional_get(["Wall Post", "Alumni"])
+def get_feed(page=1, page_size=20, sort_by="latest", cursor=None, fields=None):
     """Get alumni feed (posts)"""
     try:
-        order_by = "published_on desc" if sort_by == "latest" else "likes_count desc"
-        
-        posts = frappe.db.get_list(
+        # "trending" reads the stored time-decayed score through its (status, trending_score) index
+        order_by = {
+            "latest": "published_on desc",
+            "trending": "trending_score desc"
+        }.get(sort_by, "likes_count desc")
+        fields = parse_fields(fields, FEED_FIELDS)
+        
+        paginated = get_page(
             "Wall Post",
             filters={"status": "Published"},
-            fields=["name", "title", "content", "alumni", "featured_image", 
-                   "likes_count", "published_on"],
-            order_by=order_by
+            fields=source_columns(fields, POST_SOURCES),
+            order_by=order_by,
+            page=page,
+            page_size=page_size,
+            cursor=cursor
         )
         
-        # Enrich with alumni info
-        enriched_posts = []
-        for post in posts:
-            alumni = frappe.db.get_value("Alumni", post.alumni, 
-                                        ["first_name", "last_name", "profile_picture"])
-            post["author"] = {
-                "id": post.alumni,
-                "name": f"{alumni[0]} {alumni[1]}",
-                "profile_picture": alumni[2]
-            }
-            enriched_posts.append(post)
+        if "author" in fields:
+            # Enrich with alumni info (one query for the whole page)
+            authors = get_authors([post.alumni for post in paginated["items"]])
+            for post in paginated["items"]:
+                post["author"] = authors[post.alumni]
         
-        paginated = paginate(enriched_posts, page, page_size)
+        trim(paginated["items"], fields)
         return success_response(paginated)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
+    except Exception as e:
+        return error_response(str(e), "FEED_FETCH_ERROR", 500)
+
+@frappe.whitelist()
+def get_my_feed(page_size=20, cursor=None, fields=None):
+    """Posts from the current alumni's batch, course and institution, newest first"""
+    try:
+        alumni = get_current_alumni()
+        
+        if not alumni:
+            return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
+        
+        fields = parse_fields(fields, FEED_FIELDS)
+        
+        # Merges the precomputed segment timelines; no join on the request path
+        timeline = get_timeline(alumni, page_size, cursor, source_columns(fields, POST_SOURCES))
+        
+        if "author" in fields:
+            authors = get_authors([post.alumni for post in timeline["items"]])
+            for post in timeline["items"]:
+                post["author"] = authors[post.alumni]
+        
+        trim(timeline["items"], fields)
+        return success_response(timeline)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "FEED_FETCH_ERROR", 500)
 
@@ -378,8 +424,7 @@ def get_feed(page=1, page_size=20, sort_by="latest"):
 def create_wall_post(title, content, featured_image=None):
     """Create a new wall post"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, "name")
+        alumni = get_current_alumni()
         
         if not alumni:
             return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
@@ -407,11 +452,10 @@ def create_wall_post(title, content, featured_image=None):
 def update_wall_post(post_id, title=None, content=None, featured_image=None):
     """Update a wall post (draft only)"""
     try:
-        current_user = frappe.session.user
         post = frappe.get_doc("Wall Post", post_id)
         
         # Check permissions
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, "name")
+        alumni = get_current_alumni()
         if post.alumni != alumni:
             return error_response("Unauthorized", "PERMISSION_DENIED", 403)
         
@@ -438,35 +482,27 @@ def update_wall_post(post_id, title=None, content=None, featured_image=None):
 def like_wall_post(post_id):
     """Like a wall post"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, "name")
+        alumni = get_current_alumni()
         
         if not alumni:
             return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
         
-        # Check if already liked
-        existing_like = frappe.db.get_value(
-            "Wall Post Like",
-            {"post": post_id, "alumni": alumni}
-        )
-        
-        if existing_like:
+        # Create like; the unique (post, alumni) constraint rejects repeats
+        # and WallPostLike.after_insert bumps likes_count atomically
+        try:
+            frappe.get_doc({
+                "doctype": "Wall Post Like",
+                "post": post_id,
+                "alumni": alumni
+            }).insert()
+        except (frappe.UniqueValidationError, frappe.DuplicateEntryError):
+            frappe.db.rollback()
             return error_response("Already liked", "ALREADY_LIKED", 400)
         
-        # Create like
-        frappe.get_doc({
-            "doctype": "Wall Post Like",
-            "post": post_id,
-            "alumni": alumni
-        }).insert()
-        
-        # Update likes count
-        post = frappe.get_doc("Wall Post", post_id)
-        post.likes_count = (post.likes_count or 0) + 1
-        post.save()
+        likes_count = frappe.db.get_value("Wall Post", post_id, "likes_count")
         frappe.db.commit()
         
-        return success_response({"likes_count": post.likes_count}, "Post liked!")
+        return success_response({"likes_count": likes_count}, "Post liked!")
     except Exception as e:
         return error_response(str(e), "LIKE_ERROR", 500)
 
@@ -474,8 +510,7 @@ def like_wall_post(post_id):
 def unlike_wall_post(post_id):
     """Unlike a wall post"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, "name")
+        alumni = get_current_alumni()
         
         like_doc = frappe.db.get_value(
             "Wall Post Like",
@@ -486,40 +521,32 @@ def unlike_wall_post(post_id):
         if not like_doc:
             return error_response("Not liked yet", "NOT_LIKED", 400)
         
+        # WallPostLike.on_trash decrements likes_count atomically
         frappe.delete_doc("Wall Post Like", like_doc)
         
-        # Update likes count
-        post = frappe.get_doc("Wall Post", post_id)
-        post.likes_count = max(0, (post.likes_count or 1) - 1)
-        post.save()
+        likes_count = frappe.db.get_value("Wall Post", post_id, "likes_count")
         frappe.db.commit()
         
-        return success_response({"likes_count": post.likes_count}, "Post unliked!")
+        return success_response({"likes_count": likes_count}, "Post unliked!")
     except Exception as e:
         return error_response(str(e), "UNLIKE_ERROR", 500)
 
 @frappe.whitelist()
-def get_wall_post(post_id):
+def get_wall_post(post_id, fields=None):
     """Get a specific wall post"""
     try:
-        post = frappe.get_doc("Wall Post", post_id)
-        alumni = frappe.db.get_value("Alumni", post.alumni, 
-                                    ["first_name", "last_name", "profile_picture"])
-        
-        return success_response({
-            "id": post.name,
-            "title": post.title,
-            "content": post.content,
-            "featured_image": post.featured_image,
-            "likes_count": post.likes_count,
-            "status": post.status,
-            "published_on": post.published_on,
-            "author": {
-                "id": post.alumni,
-                "name": f"{alumni[0]} {alumni[1]}",
-                "profile_picture": alumni[2]
-            }
-        })
+        fields = parse_fields(fields, POST_FIELDS, required=("id",))
+        post = frappe.db.get_value("Wall Post", post_id, source_columns(fields, POST_SOURCES), as_dict=True)
+        if not post:
+            raise frappe.DoesNotExistError
+        
+        post["id"] = post.pop("name")
+        if "author" in fields:
+            post["author"] = get_authors([post.alumni])[post.alumni]
+        
+        return success_response(pick(post, fields))
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except frappe.DoesNotExistError:
         return error_response("Post not found", "POST_NOT_FOUND", 404)
     except Exception as e:
@@ -527,50 +554,86 @@ def get_wall_post(post_id):
 
 # ============== EVENT ENDPOINTS ==============
 
+EVENT_LIST_FIELDS = ["event_name", "event_date", "venue", "event_image", "rsvp_count", "max_capacity",
+                     "description"]
+EVENT_FIELDS = ["name", "description", "date", "venue", "image", "status", "max_capacity",
+                "seats_available", "rsvp_stats"]
+RSVP_FIELDS = ["event", "response_status", "guests", "rsvp_date", "event_details"]
+
+# Event detail response keys -> AMS Event columns
+EVENT_SOURCES = {
+    "id": ["name"],
+    "name": ["event_name"],
+    "date": ["event_date"],
+    "image": ["event_image"],
+    "seats_available": ["max_capacity", "going_count", "guest_count"],
+    "rsvp_stats": ["going_count", "maybe_count", "not_going_count", "guest_count", "waitlist_count"]
+}
+
 @frappe.whitelist()
-def get_upcoming_events(page=1, page_size=10):
+@conditional_get(["AMS Event"], ttl=60)
+def get_upcoming_events(page=1, page_size=10, cursor=None, fields=None):
     """Get upcoming events"""
     try:
-        events = frappe.db.get_list(
+        paginated = get_page(
             "AMS Event",
             filters=[
                 ["AMS Event", "status", "in", ["Upcoming", "Ongoing"]],
                 ["AMS Event", "event_date", ">=", now()]
             ],
-            fields=["name", "event_name", "event_date", "venue", "event_image", 
-                   "rsvp_count", "max_capacity", "description"],
-            order_by="event_date asc"
+            fields=parse_fields(fields, EVENT_LIST_FIELDS),
+            order_by="event_date asc",
+            page=page,
+            page_size=page_size,
+            cursor=cursor
         )
-        
-        paginated = paginate(events, page, page_size)
+
         return success_response(paginated)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "EVENTS_FETCH_ERROR", 500)
 
 @frappe.whitelist()
-def get_event_details(event_id):
+def get_event_details(event_id, fields=None):
     """Get detailed event information"""
     try:
-        event = frappe.get_doc("AMS Event", event_id)
+        fields = parse_fields(fields, EVENT_FIELDS, required=("id",))
+        event = frappe.db.get_value("AMS Event", event_id, source_columns(fields, EVENT_SOURCES), as_dict=True)
+        if not event:
+            raise frappe.DoesNotExistError
         
-        # Get RSVP stats
-        rsvp_stats = {
-            "going": frappe.db.count("Event RSVP", {"event": event.name, "response_status": "Going"}),
-            "maybe": frappe.db.count("Event RSVP", {"event": event.name, "response_status": "Maybe"}),
-            "not_going": frappe.db.count("Event RSVP", {"event": event.name, "response_status": "Not Going"})
+        details = {
+            "id": event.name,
+            "name": event.get("event_name"),
+            "description": event.get("description"),
+            "date": event.get("event_date"),
+            "venue": event.get("venue"),
+            "image": event.get("event_image"),
+            "status": event.get("status"),
+            "max_capacity": event.get("max_capacity")
         }
         
-        return success_response({
-            "id": event.name,
-            "name": event.event_name,
-            "description": event.description,
-            "date": event.event_date,
-            "venue": event.venue,
-            "image": event.event_image,
-            "status": event.status,
-            "max_capacity": event.max_capacity,
-            "rsvp_stats": rsvp_stats
-        })
+        if "rsvp_stats" in fields:
+            # RSVP stats are maintained incrementally on the event row
+            details["rsvp_stats"] = {
+                "going": event.going_count,
+                "maybe": event.maybe_count,
+                "not_going": event.not_going_count,
+                "guests": event.guest_count,
+                "waitlisted": event.waitlist_count
+            }
+        
+        if "seats_available" in fields:
+            details["seats_available"] = None
+            if event.max_capacity:
+                details["seats_available"] = max(
+                    0, event.max_capacity - (event.going_count or 0) - (event.guest_count or 0)
+                )
+        
+        return success_response(pick(details, fields))
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except frappe.DoesNotExistError:
         return error_response("Event not found", "EVENT_NOT_FOUND", 404)
     except Exception as e:
@@ -580,12 +643,14 @@ def get_event_details(event_id):
 def rsvp_event(event_id, response_status="Going", guests=0):
     """RSVP to an event"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, "name")
+        alumni = get_current_alumni()
         
         if not alumni:
             return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
         
+        if response_status not in ("Going", "Maybe", "Not Going"):
+            return error_response("Invalid response status", "INVALID_RSVP_STATUS", 400)
+        
         # Check if already RSVPed
         existing_rsvp = frappe.db.get_value(
             "Event RSVP",
@@ -610,46 +675,64 @@ def rsvp_event(event_id, response_status="Going", guests=0):
         
         frappe.db.commit()
         
-        return success_response({"rsvp_id": rsvp.name}, "RSVP updated successfully")
+        if rsvp.response_status == "Waitlisted":
+            return success_response(
+                {
+                    "rsvp_id": rsvp.name,
+                    "response_status": rsvp.response_status,
+                    "waitlist_position": get_waitlist_position(rsvp.name)
+                },
+                "Event is full. You have been added to the waitlist."
+            )
+        
+        return success_response(
+            {"rsvp_id": rsvp.name, "response_status": rsvp.response_status},
+            "RSVP updated successfully"
+        )
+    except EventCapacityError as e:
+        return error_response(str(e), "EVENT_FULL", 409)
     except Exception as e:
         return error_response(str(e), "RSVP_ERROR", 500)
 
 @frappe.whitelist()
-def get_my_rsvps():
+def get_my_rsvps(fields=None):
     """Get current user's event RSVPs"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, "name")
+        alumni = get_current_alumni()
         
         if not alumni:
             return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
         
+        fields = parse_fields(fields, RSVP_FIELDS)
         rsvps = frappe.db.get_list(
             "Event RSVP",
             filters={"alumni": alumni},
-            fields=["name", "event", "response_status", "guests", "rsvp_date"]
+            fields=source_columns(fields, {"event_details": ["event"]})
         )
         
-        # Enrich with event info
-        enriched = []
-        for rsvp in rsvps:
-            event = frappe.db.get_value("AMS Event", rsvp.event, 
-                                       ["event_name", "event_date", "venue"])
-            rsvp["event_details"] = {
-                "id": rsvp.event,
-                "name": event[0],
-                "date": event[1],
-                "venue": event[2]
-            }
-            enriched.append(rsvp)
-        
-        return success_response({"rsvps": enriched})
+        if "event_details" in fields:
+            # Enrich with event info (one query for all RSVPs)
+            events = event_loader().load_many([rsvp.event for rsvp in rsvps])
+            for rsvp in rsvps:
+                event = events.get(rsvp.event) or {}
+                rsvp["event_details"] = {
+                    "id": rsvp.event,
+                    "name": event.get("event_name"),
+                    "date": event.get("event_date"),
+                    "venue": event.get("venue")
+                }
+        
+        trim(rsvps, fields)
+        return success_response({"rsvps": rsvps})
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "MY_RSVPS_ERROR", 500)
 
 # ============== DONATION ENDPOINTS ==============
 
 @frappe.whitelist(allow_guest=True)
+@rate_limited("create_donation", email_arg="donor_email")
 def create_donation(donor_name, donor_email, amount, purpose="General Fund", 
                    payment_method="Card", payment_reference=None):
     """Create a donation record"""
@@ -683,30 +766,29 @@ def create_donation(donor_name, donor_email, amount, purpose="General Fund",
 def get_donation_stats():
     """Get donation statistics"""
     try:
-        total = frappe.db.get_value(
-            "Donation",
-            filters={"status": "Completed"},
-            fieldname="sum(amount)"
-        ) or 0
-        
-        count = frappe.db.count("Donation", filters={"status": "Completed"})
+        stats = get_stats()
+        total = stats["total_donations"]
+        count = stats["total_donors"]
         
         return success_response({
             "total_amount": total,
             "total_donors": count,
-            "average_donation": total / count if count > 0 else 0
+            "average_donation": total / count if count > 0 else 0,
+            "as_of": stats["as_of"]
         })
     except Exception as e:
         return error_response(str(e), "STATS_ERROR", 500)
 
 # ============== MEMBERSHIP ENDPOINTS ==============
 
+MEMBERSHIP_FIELDS = ["type", "status", "expiry_date", "start_date"]
+
 @frappe.whitelist()
-def check_membership_status():
+def check_membership_status(fields=None):
     """Check current user's membership status"""
     try:
-        current_user = frappe.session.user
-        alumni = frappe.db.get_value("Alumni", {"email": current_user}, "name")
+        fields = parse_fields(fields, MEMBERSHIP_FIELDS, required=("id",))
+        alumni = get_current_alumni()
         
         if not alumni:
             return error_response("Alumni profile not found", "PROFILE_NOT_FOUND", 404)
@@ -718,34 +800,69 @@ def check_membership_status():
         )
         
         if membership:
-            return success_response({
+            return success_response(pick({
                 "id": membership[0],
                 "type": membership[1],
-                "status": membership[2],
+                # Correct even before the nightly expiry sweep has run
+                "status": effective_status(membership[2], membership[3]),
                 "expiry_date": membership[3],
                 "start_date": membership[4]
-            })
+            }, fields))
         else:
             return success_response(None, "No active membership")
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
     except Exception as e:
         return error_response(str(e), "MEMBERSHIP_ERROR", 500)
 
 # ============== INSTITUTION ENDPOINTS ==============
 
+INSTITUTION_FIELDS = ["institution_name", "institution_code", "institution_type", "city", "country",
+                      "contact_email", "website", "alumni_count"]
+
 @frappe.whitelist()
-def get_institutions(page=1, page_size=50):
-    """Get all institutions"""
+@conditional_get(["Institution", "Alumni"])
+def get_institutions(page=1, page_size=50, cursor=None, as_tree=0, root=None, fields=None):
+    """Get all institutions, as a flat page or as a tree with alumni counts"""
     try:
-        institutions = frappe.db.get_list(
+        if cint(as_tree):
+            return success_response({"tree": get_tree(root)})
+        
+        fields = parse_fields(fields, INSTITUTION_FIELDS)
+        paginated = get_page(
             "Institution",
             filters={"status": "Active"},
-            fields=["name", "institution_name", "institution_code", "institution_type", 
-                   "city", "country", "contact_email", "website"],
-            order_by="institution_name asc"
+            fields=source_columns(fields, {"alumni_count": []}),
+            order_by="institution_name asc",
+            page=page,
+            page_size=page_size,
+            cursor=cursor
         )
         
-        paginated = paginate(institutions, page, page_size)
+        if "alumni_count" in fields:
+            # Subtree alumni counts from the cached rollup
+            counts = get_rollup([item.name for item in paginated["items"]])
+            for item in paginated["items"]:
+                item["alumni_count"] = counts.get(item.name, 0)
+
         return success_response(paginated)
+    except InvalidFieldsError as e:
+        return error_response(str(e), "INVALID_FIELDS", 400)
+    except frappe.DoesNotExistError:
+        return error_response("Institution not found", "INSTITUTION_NOT_FOUND", 404)
+    except Exception as e:
+        return error_response(str(e), "INSTITUTIONS_ERROR", 500)
+
+@frappe.whitelist()
+def get_institution_alumni_count(institution):
+    """Count active alumni of an institution including all its descendants"""
+    try:
+        return success_response({
+            "institution": institution,
+            "alumni_count": count_alumni_in_subtree(institution)
+        })
+    except frappe.DoesNotExistError:
+        return error_response("Institution not found", "INSTITUTION_NOT_FOUND", 404)
     except Exception as e:
         return error_response(str(e), "INSTITUTIONS_ERROR", 500)
 
@@ -755,23 +872,129 @@ def get_institutions(page=1, page_size=50):
 def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
-        total_alumni = frappe.db.count("Alumni", {"status": "Active"})
-        total_posts = frappe.db.count("Wall Post", {"status": "Published"})
-        total_donations = frappe.db.get_value(
-            "Donation",
-            filters={"status": "Completed"},
-            fieldname="sum(amount)"
-        ) or 0
-        upcoming_events = frappe.db.count(
-            "AMS Event",
-            filters=[["AMS Event", "event_date", ">=", now()]]
-        )
+        # Materialized counters, kept current by document events
+        stats = get_stats()
         
         return success_response({
-            "total_alumni": total_alumni,
-            "total_posts": total_posts,
-            "total_donations": total_donations,
-            "upcoming_events": upcoming_events
+            "total_alumni": stats["total_alumni"],
+            "total_posts": stats["total_posts"],
+            "total_donations": stats["total_donations"],
+            "upcoming_events": stats["upcoming_events"],
+            "as_of": stats["as_of"],
+            "last_full_refresh": stats["last_full_refresh"]
         })
     except Exception as e:
-        return error_response(str(e), "STATS_ERROR", 500)
\ No newline at end of file
+        return error_response(str(e), "STATS_ERROR", 500)
+
+@frappe.whitelist()
+def get_engagement_trends(from_date=None, to_date=None):
+    """Monthly new alumni / posts / donations series from the stored snapshots"""
+    try:
+        return success_response(get_series(from_date, to_date))
+    except Exception as e:
+        return error_response(str(e), "TRENDS_ERROR", 500)
+
+@frappe.whitelist()
+def get_profile_cache_stats():
+    """Hit/miss counters for the alumni profile cache"""
+    try:
+        frappe.only_for("System Manager")
+        return success_response(get_cache_stats())
+    except frappe.PermissionError:
+        return error_response("Not permitted", "PERMISSION_DENIED", 403)
+    except Exception as e:
+        return error_response(str(e), "CACHE_STATS_ERROR", 500)
+
+@frappe.whitelist()
+def get_rate_limit_metrics():
+    """Allowed/rejected counts for the rate-limited guest endpoints"""
+    try:
+        frappe.only_for("System Manager")
+        return success_response(get_rate_limit_counts())
+    except frappe.PermissionError:
+        return error_response("Not permitted", "PERMISSION_DENIED", 403)
+    except Exception as e:
+        return error_response(str(e), "RATE_LIMIT_METRICS_ERROR", 500)
+
+# ============== BATCH ==============
+
+MAX_BATCH_CALLS = 20
+
+# Endpoints callable through `batch`
+BATCH_METHODS = {
+    "get_current_user",
+    "get_alumni_profile",
+    "search_alumni",
+    "get_alumni_by_batch",
+    "get_alumni_by_course",
+    "get_alumni_by_institution",
+    "get_feed",
+    "get_my_feed",
+    "get_wall_post",
+    "get_upcoming_events",
+    "get_event_details",
+    "get_my_rsvps",
+    "get_donation_stats",
+    "check_membership_status",
+    "get_institutions",
+    "get_institution_alumni_count",
+    "get_dashboard_stats",
+    "get_engagement_trends",
+    "update_alumni_profile",
+    "create_wall_post",
+    "update_wall_post",
+    "like_wall_post",
+    "unlike_wall_post",
+    "rsvp_event"
+}
+
+def _run_batch_call(method, args):
+    """Invoke one allowlisted endpoint, keeping failures in its own envelope"""
+    try:
+        return globals()[method](**args)
+    except TypeError as e:
+        return error_response(str(e), "INVALID_ARGS", 400)
+    except Exception as e:
+        return error_response(str(e), "BATCH_CALL_ERROR", 500)
+
+@frappe.whitelist()
+def batch(calls):
+    """Run several AMS endpoints in one request.
+
+    `calls` is a list of {"method": "get_feed", "args": {...}}; they run in
+    order on the request's connection, so later calls see earlier writes.
+    Results come back in the same order, each in its own success/error envelope."""
+    try:
+        if isinstance(calls, str):
+            calls = json.loads(calls)
+        
+        if not isinstance(calls, list):
+            return error_response("calls must be a list", "INVALID_BATCH", 400)
+        if len(calls) > MAX_BATCH_CALLS:
+            return error_response(f"At most {MAX_BATCH_CALLS} calls per batch", "BATCH_TOO_LARGE", 400)
+        
+        results = [None] * len(calls)
+        pending = []
+        
+        for i, call in enumerate(calls):
+            method = call.get("method") if isinstance(call, dict) else None
+            args = (call.get("args") if isinstance(call, dict) else None) or {}
+            
+            if method not in BATCH_METHODS:
+                results[i] = error_response(f"Method not allowed in batch: {method}", "METHOD_NOT_ALLOWED", 400)
+            elif not isinstance(args, dict):
+                results[i] = error_response("args must be an object", "INVALID_ARGS", 400)
+            else:
+                pending.append((i, method, args))
+        
+        # Conditional GET applies to the batch request, not to each call
+        frappe.flags.ams_in_batch = True
+        
+        for i, method, args in pending:
+            results[i] = _run_batch_call(method, args)
+        
+        return success_response({"results": results})
+    except json.JSONDecodeError:
+        return error_response("calls must be valid JSON", "INVALID_BATCH", 400)
+    except Exception as e:
+        return error_response(str(e), "BATCH_ERROR", 500)
\ No newline at end of file
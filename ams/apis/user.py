@@ -1,6 +1,9 @@
 import frappe
 import json
 import requests
+from frappe.utils import getdate, now
+from ams.api import error_response, success_response
+from ams.outbox import enqueue_email
 from ams.utils import createAPIErrorLog
 
 
@@ -95,4 +98,243 @@ def disableUser():
                         frappe.db.commit()
                         return email + " User Disabled Successfully"
     except Exception:
-        createAPIErrorLog(frappe.get_traceback())
\ No newline at end of file
+        createAPIErrorLog(frappe.get_traceback())
+
+BULK_CHUNK_SIZE = 500
+BULK_USER_FIELDS = ["first_name", "last_name", "gender", "phone", "birth_date", "location"]
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+def _iter_records():
+    """Yield (line, record) pairs from an NDJSON or JSON array body"""
+    if frappe.request.mimetype in NDJSON_TYPES:
+        # make_form_dict has already drained request.stream into the buffered body
+        for line, raw in enumerate(frappe.request.get_data(as_text=True).splitlines(), 1):
+            if not raw.strip():
+                continue
+            try:
+                yield line, json.loads(raw)
+            except ValueError as e:
+                yield line, e
+    else:
+        records = json.loads(frappe.request.data or "[]")
+        for line, record in enumerate(records if isinstance(records, list) else [records], 1):
+            yield line, record
+
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _allocate_usernames(bases):
+    """Free usernames for the given base names, from a single prefetch query"""
+    bases = {base for base in bases if base}
+    taken = set()
+    if bases:
+        taken = set(frappe.db.sql_list(
+            "select username from `tabUser` where {}".format(" or ".join(["username like %s"] * len(bases))),
+            [f"{base}%" for base in bases]
+        ))
+
+    def allocate(base):
+        username, suffix = base, 0
+        while not username or username in taken:
+            suffix += 1
+            username = f"{base}{suffix}"
+        taken.add(username)
+        return username
+
+    return allocate
+
+
+def _bulk_update(changes):
+    """Write {user: {field: value}} with one multi-row UPDATE per distinct field set"""
+    groups = {}
+    for name, values in changes.items():
+        groups.setdefault(tuple(sorted(values)), []).append(name)
+
+    timestamp = now()
+    for fields, names in groups.items():
+        assignments, params = [], []
+        for field in fields:
+            assignments.append("`{}` = case name {} end".format(field, " ".join(["when %s then %s"] * len(names))))
+            for name in names:
+                params.extend([name, changes[name][field]])
+
+        frappe.db.sql(
+            "update `tabUser` set {}, modified = %s, modified_by = %s where name in ({})".format(
+                ", ".join(assignments), ", ".join(["%s"] * len(names))
+            ),
+            [*params, timestamp, frappe.session.user, *names]
+        )
+
+
+def _is_disable(record):
+    return record.get("action") == "disable" or record.get("enabled") in (0, False, "0")
+
+
+def _validate_record(record, genders):
+    """Check and normalize the fields a raw UPDATE would write unvalidated; returns an error or None"""
+    if record.get("gender") and record["gender"] not in genders:
+        return f"gender {record['gender']} does not exist"
+
+    if record.get("birth_date"):
+        try:
+            record["birth_date"] = str(getdate(record["birth_date"]))
+        except Exception:
+            return f"birth_date {record['birth_date']} is not a valid date"
+
+
+def _upsert_chunk(chunk):
+    """Apply one chunk: one prefetch, in-memory diff, changed rows only, one commit"""
+    results = []
+    valid = []
+    for line, record in chunk:
+        if not isinstance(record, dict) or not record.get("email"):
+            error = str(record) if isinstance(record, Exception) else "email is required"
+            results.append({"line": line, "email": None, "status": "error", "message": error})
+        else:
+            valid.append((line, record))
+
+    emails = list({record["email"] for line, record in valid})
+    existing = {
+        user.email: user
+        for user in frappe.get_all(
+            "User",
+            filters={"email": ["in", emails]},
+            fields=["name", "email", "enabled", *BULK_USER_FIELDS]
+        )
+    } if emails else {}
+
+    genders = set(frappe.get_all("Gender", pluck="name"))
+    new_records = [record for line, record in valid if record["email"] not in existing and not _is_disable(record)]
+    allocate = _allocate_usernames(
+        frappe.scrub(record.get("first_name") or record["email"].split("@")[0]).strip(" @")
+        for record in new_records
+    )
+
+    disabled = []
+    updates = {}
+    for line, record in valid:
+        email = record["email"]
+        user = existing.get(email)
+        result = {"line": line, "email": email}
+        results.append(result)
+
+        try:
+            if _is_disable(record):
+                if not user:
+                    result["status"] = "not_found"
+                elif not user.enabled:
+                    result["status"] = "already_disabled"
+                else:
+                    updates.setdefault(user.name, {})["enabled"] = 0
+                    user.enabled = 0
+                    disabled.append(user.name)
+                    result["status"] = "disabled"
+                continue
+
+            error = _validate_record(record, genders)
+            if error:
+                result["status"] = "error"
+                result["message"] = error
+                continue
+
+            if user:
+                changes = {
+                    field: record.get(field)
+                    for field in BULK_USER_FIELDS
+                    if field in record and str(user.get(field) or "") != str(record.get(field) or "")
+                }
+                if not changes:
+                    result["status"] = "unchanged"
+                    continue
+
+                if "first_name" in changes or "last_name" in changes:
+                    changes["full_name"] = " ".join(
+                        filter(None, [changes.get("first_name", user.first_name),
+                                      changes.get("last_name", user.last_name)])
+                    )
+                updates.setdefault(user.name, {}).update(changes)
+                user.update(changes)
+                result["status"] = "updated"
+                result["fields"] = sorted(changes)
+                continue
+
+            frappe.db.savepoint("bulk_user")
+            try:
+                doc = frappe.new_doc("User")
+                doc.update({field: record.get(field) for field in BULK_USER_FIELDS if record.get(field)})
+                doc.email = email
+                doc.username = allocate(
+                    frappe.scrub(record.get("first_name") or email.split("@")[0]).strip(" @")
+                )
+                # One outbox row instead of a synchronous Frappe welcome mail per user
+                doc.send_welcome_email = 0
+                doc.append("roles", {"role": "Employee"})
+                doc.insert(ignore_permissions=True)
+                enqueue_email("alumni_welcome", email, "User", doc.name, {"first_name": doc.first_name})
+            except Exception:
+                frappe.db.rollback(save_point="bulk_user")
+                raise
+
+            existing[email] = frappe._dict(name=doc.name, email=email, enabled=1,
+                                           **{field: doc.get(field) for field in BULK_USER_FIELDS})
+            result["status"] = "created"
+        except Exception as e:
+            result["status"] = "error"
+            result["message"] = str(e)
+
+    _bulk_update(updates)
+    frappe.db.commit()
+    results.sort(key=lambda result: result["line"])
+
+    # A raw update does not end sessions the way User.save() does
+    from frappe.sessions import clear_sessions
+    for name in disabled:
+        clear_sessions(user=name, force=True)
+        frappe.clear_cache(user=name)
+
+    return results
+
+
+@frappe.whitelist()
+def bulkUpsertUsers():
+    """Create, update or disable many users from an NDJSON stream or a JSON array.
+
+    Records look like createUser/updateUser payloads; `"action": "disable"` or
+    `"enabled": 0` disables the user instead. Returns a per-record report."""
+    try:
+        frappe.only_for("System Manager")
+
+        results = []
+        for chunk in _chunks(_iter_records(), BULK_CHUNK_SIZE):
+            try:
+                results.extend(_upsert_chunk(chunk))
+            except Exception as e:
+                # Earlier chunks are committed; report this one as failed and carry on
+                frappe.db.rollback()
+                createAPIErrorLog(frappe.get_traceback())
+                results.extend(
+                    {"line": line, "email": record.get("email") if isinstance(record, dict) else None,
+                     "status": "error", "message": str(e)}
+                    for line, record in chunk
+                )
+
+        summary = {}
+        for result in results:
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+
+        return success_response({"summary": summary, "results": results})
+    except frappe.PermissionError:
+        raise
+    except Exception as e:
+        frappe.db.rollback()
+        return error_response(str(e), "BULK_USER_ERROR", 500)
@@ -0,0 +1,81 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+def run_on_site(context, method, message):
+    """Connect to the selected site, run `method` and commit"""
+    import frappe
+
+    frappe.init(site=get_site(context))
+    frappe.connect()
+    try:
+        method()
+        frappe.db.commit()
+        click.echo(message)
+    finally:
+        frappe.destroy()
+
+
+@click.command("ams-rebuild-search-index")
+@pass_context
+def rebuild_search_index(context):
+    """Rebuild the Alumni full-text search index"""
+    from ams.search import rebuild_index
+
+    run_on_site(context, rebuild_index, "Alumni search index rebuilt")
+
+
+@click.command("ams-reconcile-like-counts")
+@pass_context
+def reconcile_like_counts(context):
+    """Recompute Wall Post likes_count from Wall Post Like rows"""
+    from ams.counters import reconcile_like_counts
+
+    run_on_site(context, reconcile_like_counts, "Wall Post like counts reconciled")
+
+
+@click.command("ams-repair-rsvp-counts")
+@pass_context
+def repair_rsvp_counts(context):
+    """Recompute AMS Event RSVP counters from Event RSVP rows"""
+    from ams.counters import repair_rsvp_counts
+
+    run_on_site(context, repair_rsvp_counts, "AMS Event RSVP counts repaired")
+
+
+@click.command("ams-rebuild-timelines")
+@pass_context
+def rebuild_timelines(context):
+    """Rebuild the per-segment Wall Post timelines from published posts"""
+    from ams.timelines import rebuild_timelines
+
+    run_on_site(context, rebuild_timelines, "Wall Post timelines rebuilt")
+
+
+@click.command("ams-backfill-monthly-stats")
+@pass_context
+def backfill_monthly_stats(context):
+    """Compute AMS Monthly Stats snapshots for every past month"""
+    from ams.snapshots import backfill
+
+    run_on_site(context, backfill, "Monthly stats snapshots backfilled")
+
+
+@click.command("ams-run-retention")
+@click.option("--dry-run", is_flag=True, default=False, help="Only count what would be deleted")
+@click.option("--doctype", "doctypes", multiple=True, help="Limit to these doctypes")
+@pass_context
+def run_retention(context, dry_run=False, doctypes=None):
+    """Purge old AMS data according to the retention policies"""
+    import json
+
+    from ams.retention import run_retention
+
+    def run():
+        click.echo(json.dumps(run_retention(dry_run=dry_run, doctypes=doctypes), indent=1))
+
+    run_on_site(context, run, "Dry run finished, nothing deleted" if dry_run else "Retention policies applied")
+
+
+commands = [rebuild_search_index, reconcile_like_counts, repair_rsvp_counts, rebuild_timelines,
+            backfill_monthly_stats, run_retention]
@@ -0,0 +1,96 @@
+import functools
+import hashlib
+import time
+
+import frappe
+from frappe.utils import cint
+
+VERSION_KEY = "ams:version:{}"
+
+# ============== VERSION COUNTERS ==============
+
+def _version_key(resource):
+    return frappe.cache().make_key(VERSION_KEY.format(resource))
+
+def bump_version(*resources):
+    """Invalidate ETags built on these resources, now and again after commit"""
+    resources = [resource for resource in resources if resource]
+    if not resources:
+        return
+
+    def bump():
+        pipe = frappe.cache().pipeline()
+        for resource in resources:
+            pipe.incr(_version_key(resource))
+        pipe.execute()
+
+    bump()
+    frappe.db.after_commit.add(bump)
+
+def get_versions(resources):
+    """Current version counter of each resource (one MGET)"""
+    if not resources:
+        return []
+    return [cint(value) for value in frappe.cache().mget([_version_key(resource) for resource in resources])]
+
+# ============== CONDITIONAL GET ==============
+
+def compute_etag(endpoint, kwargs, resources, per_user=False, ttl=None):
+    """Cheap version token for an endpoint + filter set; never touches MariaDB"""
+    parts = [endpoint, sorted((key, str(value)) for key, value in kwargs.items()), resources,
+             get_versions(resources)]
+    if per_user:
+        parts.append(frappe.session.user)
+    if ttl:
+        # Time-dependent results (e.g. "upcoming") also roll over every `ttl` seconds
+        parts.append(int(time.time() // ttl))
+
+    return 'W/"{}"'.format(hashlib.md5(frappe.as_json(parts).encode()).hexdigest())
+
+def set_response_header(key, value):
+    """Add a header to the HTTP response, when there is one"""
+    headers = getattr(frappe.local, "response_headers", None)
+    if headers is not None:
+        headers[key] = value
+
+def conditional_get(resources, per_user=False, ttl=None):
+    """Answer If-None-Match with 304 before the endpoint builds its body.
+
+    `resources` is a list of version-counter names, or a callable taking the
+    endpoint kwargs and returning one (e.g. a per-alumni resource)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            kwargs = frappe.get_newargs(fn, kwargs)
+            request = getattr(frappe.local, "request", None)
+
+            if args or not request or request.method != "GET" or frappe.flags.ams_in_batch:
+                return fn(*args, **kwargs)
+
+            names = resources(kwargs) if callable(resources) else resources
+            etag = compute_etag(fn.__name__, kwargs, names, per_user, ttl)
+            set_response_header("ETag", etag)
+            set_response_header("Cache-Control", "private, no-cache")
+
+            if etag in (frappe.get_request_header("If-None-Match") or ""):
+                frappe.local.response.http_status_code = 304
+                return None
+
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+# ============== INVALIDATION HOOKS ==============
+
+def on_doc_change(doc, method=None):
+    """doc_events hook: bump the doctype's version and the owning alumni's"""
+    resources = [doc.doctype]
+
+    if doc.doctype == "Alumni":
+        resources.append(f"Alumni:{doc.name}")
+    elif doc.get("alumni"):
+        resources.append(f"Alumni:{doc.alumni}")
+
+    bump_version(*resources)
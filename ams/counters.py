@@ -0,0 +1,113 @@
+import frappe
+from frappe.utils import cint
+
+from ams.conditional import bump_version
+
+# ============== ATOMIC COUNTERS ==============
+
+def update_counters(doctype, name, deltas):
+    """Atomically add each {field: delta} to its counter column in one UPDATE.
+
+    Concurrent writers never lose increments and no document is loaded,
+    validated, versioned or saved. `modified` is left untouched on purpose:
+    a counter change is not an edit of the document."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    assignments = ", ".join(
+        f"`{field}` = greatest(coalesce(`{field}`, 0) + %({field})s, 0)" for field in deltas
+    )
+    frappe.db.sql(
+        f"update `tab{doctype}` set {assignments} where name = %(name)s",
+        dict(deltas, name=name)
+    )
+    # Counters are part of list payloads, so cached ETags must roll over
+    bump_version(doctype)
+
+def increment(doctype, name, field, delta=1):
+    """Atomically add `delta` to a counter column and return the new value"""
+    update_counters(doctype, name, {field: delta})
+    return frappe.db.get_value(doctype, name, field) or 0
+
+def decrement(doctype, name, field, delta=1):
+    return increment(doctype, name, field, -delta)
+
+# ============== WALL POST LIKES ==============
+
+def increment_likes(post):
+    return increment("Wall Post", post, "likes_count")
+
+def decrement_likes(post):
+    return decrement("Wall Post", post, "likes_count")
+
+def reconcile_like_counts():
+    """Rebuild Wall Post likes_count from Wall Post Like rows (drift repair)"""
+    frappe.db.sql(
+        """update `tabWall Post` post
+        left join (
+            select `post`, count(*) as total
+            from `tabWall Post Like`
+            group by `post`
+        ) likes on likes.post = post.name
+        set post.likes_count = coalesce(likes.total, 0)
+        where coalesce(post.likes_count, 0) != coalesce(likes.total, 0)"""
+    )
+
+# ============== EVENT RSVP COUNTS ==============
+
+RSVP_STATUS_FIELDS = {
+    "Going": "going_count",
+    "Maybe": "maybe_count",
+    "Not Going": "not_going_count",
+    "Waitlisted": "waitlist_count"
+}
+
+def _rsvp_contribution(rsvp):
+    """Counter values a single RSVP contributes to its event"""
+    if not rsvp:
+        return {}
+
+    contribution = {"rsvp_count": 1}
+    field = RSVP_STATUS_FIELDS.get(rsvp.response_status)
+    if field:
+        contribution[field] = 1
+    if rsvp.response_status == "Going":
+        contribution["guest_count"] = cint(rsvp.guests)
+    return contribution
+
+def apply_rsvp_change(before, after):
+    """Move an RSVP's contribution from `before` to `after` (either may be None)"""
+    removed, added = _rsvp_contribution(before), _rsvp_contribution(after)
+
+    if before and after and before.event != after.event:
+        update_counters("AMS Event", before.event, {field: -value for field, value in removed.items()})
+        update_counters("AMS Event", after.event, added)
+        return
+
+    event = (after or before).event
+    deltas = {field: added.get(field, 0) - removed.get(field, 0) for field in set(removed) | set(added)}
+    update_counters("AMS Event", event, deltas)
+
+def repair_rsvp_counts():
+    """Recompute every AMS Event's RSVP counters with a single GROUP BY"""
+    frappe.db.sql(
+        """update `tabAMS Event` event
+        left join (
+            select `event`,
+                count(*) as total,
+                sum(response_status = 'Going') as going,
+                sum(response_status = 'Maybe') as maybe,
+                sum(response_status = 'Not Going') as not_going,
+                sum(response_status = 'Waitlisted') as waitlisted,
+                sum(if(response_status = 'Going', coalesce(guests, 0), 0)) as guests
+            from `tabEvent RSVP`
+            group by `event`
+        ) rsvp on rsvp.event = event.name
+        set event.rsvp_count = coalesce(rsvp.total, 0),
+            event.going_count = coalesce(rsvp.going, 0),
+            event.maybe_count = coalesce(rsvp.maybe, 0),
+            event.not_going_count = coalesce(rsvp.not_going, 0),
+            event.waitlist_count = coalesce(rsvp.waitlisted, 0),
+            event.guest_count = coalesce(rsvp.guests, 0)"""
+    )
@@ -0,0 +1,196 @@
+import time
+
+import frappe
+from frappe.utils import add_months, cint, get_first_day, now, today
+
+# Active alumni per worker job, and recipients per queued email (sendmail keeps
+# up to 100 recipients in one Email Queue row inside the current transaction)
+SHARD_SIZE = 5000
+CHUNK_SIZE = 100
+
+PROGRESS_KEY = "ams:digest:progress:{}"
+PROGRESS_TTL = 60 * 60 * 24 * 40  # seconds; outlives the month it tracks
+
+DIGEST_SUBJECT = "Your Monthly Alumni Network Digest"
+DIGEST_MESSAGE = """
+<p>Hi,</p>
+<p><strong>This Month's Highlights:</strong></p>
+<ul>
+    <li>New Alumni Members: {{ new_alumni }}</li>
+    <li>New Posts: {{ new_posts }}</li>
+    <li>Upcoming Events: {{ upcoming_events | length }}</li>
+</ul>
+{% if top_posts %}
+<p><strong>Top Posts:</strong></p>
+<ul>
+    {% for post in top_posts %}<li>{{ post.title }} ({{ post.likes_count }} likes)</li>{% endfor %}
+</ul>
+{% endif %}
+{% if upcoming_events %}
+<p><strong>Coming Up:</strong></p>
+<ul>
+    {% for event in upcoming_events %}<li>{{ event.event_name }}, {{ event.event_date }} at {{ event.venue }}</li>{% endfor %}
+</ul>
+{% endif %}
+<p>Keep engaging with your alumni network!</p>
+"""
+
+# ============== CONTENT ==============
+
+def build_digest(first_day):
+    """Digest context shared by every recipient, computed once per run.
+
+    Counts cover the month starting at `first_day` only."""
+    next_month = get_first_day(add_months(first_day, 1))
+    return {
+        "new_alumni": frappe.db.count("Alumni", filters=[
+            ["Alumni", "joined_on", ">=", first_day],
+            ["Alumni", "joined_on", "<", next_month]
+        ]),
+        "new_posts": frappe.db.count("Wall Post", filters=[
+            ["Wall Post", "published_on", ">=", first_day],
+            ["Wall Post", "published_on", "<", next_month],
+            ["Wall Post", "status", "=", "Published"]
+        ]),
+        "top_posts": frappe.get_all(
+            "Wall Post",
+            filters=[
+                ["Wall Post", "published_on", ">=", first_day],
+                ["Wall Post", "published_on", "<", next_month],
+                ["Wall Post", "status", "=", "Published"]
+            ],
+            fields=["title", "likes_count"],
+            order_by="likes_count desc",
+            limit_page_length=5
+        ),
+        "upcoming_events": frappe.get_all(
+            "AMS Event",
+            filters=[
+                ["AMS Event", "event_date", ">=", today()],
+                ["AMS Event", "status", "!=", "Cancelled"]
+            ],
+            fields=["event_name", "event_date", "venue"],
+            order_by="event_date asc",
+            limit_page_length=3
+        )
+    }
+
+def get_shard_bounds():
+    """First alumni name of every SHARD_SIZE-sized slice of active alumni (one query)"""
+    return [row[0] for row in frappe.db.sql(
+        """select name from (
+            select name, row_number() over (order by name) as position
+            from `tabAlumni`
+            where status = 'Active'
+        ) numbered
+        where mod(position - 1, %s) = 0
+        order by name""",
+        SHARD_SIZE
+    )]
+
+# ============== PROGRESS ==============
+
+def _progress_key(period):
+    return frappe.cache().make_key(PROGRESS_KEY.format(period))
+
+def set_progress(period, shard, **values):
+    key = _progress_key(period)
+    pipe = frappe.cache().pipeline()
+    pipe.hset(key, mapping={f"{shard}:{field}": value for field, value in values.items()})
+    pipe.expire(key, PROGRESS_TTL)
+    pipe.execute()
+
+def get_progress(period=None):
+    """{shard: {status, sent, ...}} for a digest period (default: this month's run)"""
+    period = period or get_period()
+
+    # Raw HGETALL: the cache wrapper's hgetall expects pickled values
+    pipe = frappe.cache().pipeline()
+    pipe.hgetall(_progress_key(period))
+    raw = pipe.execute()[0]
+
+    progress = {}
+    for field, value in raw.items():
+        shard, name = field.decode().rsplit(":", 1)
+        progress.setdefault(cint(shard), {})[name] = value.decode()
+    return progress
+
+# ============== COORDINATOR ==============
+
+def get_period(on_date=None):
+    """The digest covers the previous calendar month; its first day identifies the run"""
+    return str(get_first_day(add_months(on_date or today(), -1)))
+
+def send_monthly_digest():
+    """Compute the digest once and fan the recipients out to background shards.
+
+    Safe to re-run: each shard skips alumni already stamped with this period."""
+    period = get_period()
+    digest = build_digest(period)
+    subject = frappe.render_template(DIGEST_SUBJECT, digest)
+    message = frappe.render_template(DIGEST_MESSAGE, digest)
+
+    bounds = get_shard_bounds()
+    for shard, start in enumerate(bounds):
+        end = bounds[shard + 1] if shard + 1 < len(bounds) else None
+        set_progress(period, shard, status="Queued", start=start)
+        frappe.enqueue(
+            "ams.digest.send_digest_shard",
+            queue="long",
+            job_id=f"ams-digest-{period}-{shard}",
+            deduplicate=True,
+            period=period,
+            shard=shard,
+            start=start,
+            end=end,
+            subject=subject,
+            message=message
+        )
+
+    return len(bounds)
+
+# ============== WORKERS ==============
+
+def send_digest_shard(period, shard, start, end, subject, message):
+    """Queue the pre-rendered digest for active alumni with start <= name < end.
+
+    Each chunk queues its mail and stamps last_digest_period in one
+    transaction, so a retried shard resumes without resending."""
+    started = time.monotonic()
+    set_progress(period, shard, status="Running", started_on=now())
+
+    sent = 0
+    after = ""
+    while True:
+        rows = frappe.db.sql(
+            """select name, email
+            from `tabAlumni`
+            where status = 'Active'
+                and name >= %(start)s and (%(end)s is null or name < %(end)s)
+                and name > %(after)s
+                and coalesce(last_digest_period, '') != %(period)s
+            order by name
+            limit %(limit)s""",
+            {"start": start, "end": end, "after": after, "period": period, "limit": CHUNK_SIZE},
+            as_dict=True
+        )
+        if not rows:
+            break
+
+        recipients = list(dict.fromkeys(row.email for row in rows if row.email))
+        if recipients:
+            frappe.sendmail(recipients=recipients, subject=subject, message=message)
+
+        frappe.db.sql(
+            "update `tabAlumni` set last_digest_period = %s where name in %s",
+            (period, tuple(row.name for row in rows))
+        )
+        frappe.db.commit()
+
+        sent += len(recipients)
+        after = rows[-1].name
+        set_progress(period, shard, sent=sent, last=after)
+
+    set_progress(period, shard, status="Done", sent=sent, finished_on=now(),
+                 duration_seconds=round(time.monotonic() - started, 3))
+    return sent
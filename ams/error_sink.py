@@ -0,0 +1,126 @@
+import hashlib
+import json
+import random
+import sys
+
+import frappe
+from frappe.utils import cint, flt, now
+
+# Buffered errors live in three Redis hashes keyed by fingerprint
+COUNTS_KEY = "ams:errors:counts"
+PAYLOADS_KEY = "ams:errors:payloads"
+LAST_SEEN_KEY = "ams:errors:last_seen"
+DROPPED_KEY = "ams:errors:dropped"
+
+# Distinct errors kept between flushes; repeats of a buffered error are always counted
+MAX_BUFFERED = 1000
+
+# Share of 4xx errors (ALREADY_LIKED, INVALID_EMAIL, ...) that get logged at all;
+# override with `ams_client_error_sample_rate` in site_config.json
+DEFAULT_CLIENT_ERROR_SAMPLE_RATE = 0.0
+
+def _key(name):
+    return frappe.cache().make_key(name)
+
+def caller_name(depth=2):
+    """Name of the function `depth` frames up, without building a full stack"""
+    try:
+        return sys._getframe(depth).f_code.co_name
+    except ValueError:
+        return None
+
+# ============== RECORDING ==============
+
+def record_error(title, message, method=None, status_code=500):
+    """Buffer an error for the next bulk flush instead of writing an Error Log now"""
+    if cint(status_code) < 500:
+        sample_rate = flt(frappe.conf.get("ams_client_error_sample_rate", DEFAULT_CLIENT_ERROR_SAMPLE_RATE))
+        if random.random() >= sample_rate:
+            return
+
+    message = str(message)
+    fingerprint = hashlib.md5(
+        "\x00".join([str(title), str(method), message[:500]]).encode()
+    ).hexdigest()
+
+    try:
+        cache = frappe.cache()
+
+        # Raw commands on prefixed keys, in one round trip (both are O(1))
+        pipe = cache.pipeline()
+        pipe.hexists(_key(COUNTS_KEY), fingerprint)
+        pipe.hlen(_key(COUNTS_KEY))
+        exists, buffered = pipe.execute()
+
+        is_new = not exists
+        if is_new and buffered >= MAX_BUFFERED:
+            cache.incr(_key(DROPPED_KEY))
+            return
+
+        pipe = cache.pipeline()
+        pipe.hincrby(_key(COUNTS_KEY), fingerprint, 1)
+        pipe.hset(_key(LAST_SEEN_KEY), fingerprint, now())
+        if is_new:
+            pipe.hsetnx(_key(PAYLOADS_KEY), fingerprint, json.dumps({
+                "title": title,
+                "method": method,
+                "message": message,
+                "first_seen": now()
+            }))
+        pipe.execute()
+    except Exception:
+        # Never let error logging break the request; fall back to a direct write
+        frappe.log_error(title=title, message=message)
+
+# ============== FLUSHING ==============
+
+def flush_errors():
+    """Write buffered errors as Error Log rows in one bulk insert (scheduled)"""
+    pipe = frappe.cache().pipeline(transaction=True)
+    pipe.hgetall(_key(COUNTS_KEY))
+    pipe.hgetall(_key(PAYLOADS_KEY))
+    pipe.hgetall(_key(LAST_SEEN_KEY))
+    pipe.getset(_key(DROPPED_KEY), 0)
+    pipe.delete(_key(COUNTS_KEY), _key(PAYLOADS_KEY), _key(LAST_SEEN_KEY))
+    counts, payloads, last_seen, dropped, _deleted = pipe.execute()
+
+    rows = []
+    timestamp = now()
+    for fingerprint, count in counts.items():
+        payload = payloads.get(fingerprint)
+        if not payload:
+            continue
+
+        payload = json.loads(payload)
+        count = cint(count)
+        error = payload["message"]
+        if count > 1:
+            last = last_seen.get(fingerprint, b"").decode()
+            error = f"{error}\n\n(occurred {count} times between {payload['first_seen']} and {last})"
+
+        rows.append((
+            frappe.generate_hash(length=10),
+            timestamp,
+            timestamp,
+            "Administrator",
+            "Administrator",
+            (payload.get("method") or payload["title"] or "")[:140],
+            error
+        ))
+
+    if cint(dropped):
+        rows.append((
+            frappe.generate_hash(length=10), timestamp, timestamp, "Administrator", "Administrator",
+            "ams.error_sink",
+            f"{cint(dropped)} distinct errors were dropped because the buffer was full"
+        ))
+
+    if rows:
+        frappe.db.bulk_insert(
+            "Error Log",
+            fields=["name", "creation", "modified", "owner", "modified_by", "method", "error"],
+            values=rows
+        )
+        frappe.db.commit()
+
+    return len(rows)
@@ -0,0 +1,54 @@
+import json
+
+import frappe
+from frappe import _
+
+class InvalidFieldsError(frappe.ValidationError):
+    pass
+
+# ============== SPARSE FIELDSETS ==============
+
+def parse_fields(fields, allowed, required=("name",)):
+    """Response fields requested through a `fields` parameter.
+
+    Accepts a comma-separated string or a JSON list; anything outside
+    `allowed` is rejected. Without `fields`, every allowed field is returned.
+    `required` keys (the record id) are always included."""
+    if not fields:
+        return list(dict.fromkeys([*required, *allowed]))
+
+    if isinstance(fields, str):
+        fields = json.loads(fields) if fields.lstrip().startswith("[") else fields.split(",")
+
+    requested = {str(field).strip() for field in fields if str(field).strip()}
+    unknown = requested - set(allowed) - set(required)
+    if unknown:
+        frappe.throw(
+            _("Unknown field(s): {0}. Allowed: {1}").format(", ".join(sorted(unknown)), ", ".join(allowed)),
+            InvalidFieldsError
+        )
+
+    return list(dict.fromkeys([*required, *(field for field in allowed if field in requested)]))
+
+def source_columns(keys, sources=None):
+    """Database columns needed to build the given response keys.
+
+    `sources` maps computed keys to the columns they are derived from
+    (e.g. "author" -> ["alumni"]); other keys are columns themselves."""
+    sources = sources or {}
+    columns = []
+    for key in keys:
+        columns.extend(sources.get(key, [key]))
+    return list(dict.fromkeys(columns))
+
+def trim(rows, keys):
+    """Drop every key not in `keys` from each row (in place)"""
+    keep = set(keys)
+    for row in rows:
+        for key in [key for key in row if key not in keep]:
+            row.pop(key)
+    return rows
+
+def pick(data, keys):
+    """Subset of a response dict, in `keys` order"""
+    return {key: data[key] for key in keys if key in data}
@@ -137,6 +137,43 @@ app_license = "mit"
 # ---------------
 # Hook on document methods and events
 
+doc_events = {
+	("Alumni", "Wall Post", "Donation", "AMS Event"): {
+		"on_update": "ams.stats.on_doc_update",
+		"on_trash": "ams.stats.on_doc_trash"
+	},
+	"Alumni": {
+		"on_update": [
+			"ams.profiles.on_alumni_change",
+			"ams.identity.on_alumni_update",
+			"ams.institutions.on_alumni_update"
+		],
+		"on_trash": [
+			"ams.profiles.on_alumni_change",
+			"ams.identity.on_alumni_trash",
+			"ams.institutions.on_alumni_trash"
+		],
+		"after_rename": [
+			"ams.profiles.on_alumni_rename",
+			"ams.identity.on_alumni_rename"
+		]
+	},
+	"Institution": {
+		"on_update": "ams.institutions.on_institution_change",
+		"on_trash": "ams.institutions.on_institution_change",
+		"after_rename": "ams.institutions.on_institution_change"
+	},
+	("Wall Post", "Membership"): {
+		"on_update": "ams.profiles.on_linked_change",
+		"on_trash": "ams.profiles.on_linked_change"
+	},
+	("Alumni", "Wall Post", "Membership", "AMS Event", "Institution"): {
+		"on_update": "ams.conditional.on_doc_change",
+		"on_trash": "ams.conditional.on_doc_change",
+		"after_rename": "ams.conditional.on_doc_change"
+	},
+}
+
 # doc_events = {
 # 	"*": {
 # 		"on_update": "method",
@@ -148,6 +185,34 @@ app_license = "mit"
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+	"all": [
+		"ams.error_sink.flush_errors",
+		"ams.outbox.process_outbox"
+	],
+	"hourly": [
+		"ams.stats.recompute_stats",
+		"ams.institutions.rebuild_rollup",
+		"ams.trending.decay_scores",
+		"ams.tasks.send_event_reminders"
+	],
+	"daily": [
+		"ams.counters.reconcile_like_counts",
+		"ams.counters.repair_rsvp_counts",
+		"ams.timelines.trim_timelines",
+		"ams.tasks.update_expired_memberships",
+		"ams.tasks.send_membership_expiry_notifications",
+		"ams.tasks.generate_monthly_stats",
+		"ams.tasks.notify_admin_of_pending_posts"
+	],
+	"daily_long": [
+		"ams.tasks.cleanup_old_data"
+	],
+	"monthly_long": [
+		"ams.tasks.send_monthly_digest"
+	],
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"ams.tasks.all"
@@ -0,0 +1,70 @@
+import frappe
+
+# user (email) -> Alumni name; "" marks a user known to have no usable Alumni record
+IDENTITY_CACHE_KEY = "ams:alumni_by_user"
+
+# Deactivated alumni resolve to no record, so they cannot post, like or RSVP
+EXCLUDED_STATUSES = ["Inactive"]
+
+# ============== IDENTITY RESOLUTION ==============
+
+def get_alumni_for_user(user):
+    """Resolve a user's Alumni record, hitting the database once per user
+    until the mapping is invalidated. Inactive alumni are not resolved."""
+    if not user or user == "Guest":
+        return None
+
+    if not hasattr(frappe.local, "ams_alumni_by_user"):
+        frappe.local.ams_alumni_by_user = {}
+
+    memo = frappe.local.ams_alumni_by_user
+    if user in memo:
+        return memo[user]
+
+    alumni = frappe.cache().hget(IDENTITY_CACHE_KEY, user)
+    if alumni is None:
+        alumni = frappe.db.get_value(
+            "Alumni", {"email": user, "status": ["not in", EXCLUDED_STATUSES]}, "name"
+        ) or ""
+        frappe.cache().hset(IDENTITY_CACHE_KEY, user, alumni)
+
+    memo[user] = alumni or None
+    return memo[user]
+
+def get_current_alumni():
+    """Alumni record of the session user, or None"""
+    return get_alumni_for_user(frappe.session.user)
+
+def invalidate_identity(*users):
+    """Forget cached mappings now and again after commit"""
+    users = [user for user in users if user]
+    if not users:
+        return
+
+    def drop():
+        for user in users:
+            frappe.cache().hdel(IDENTITY_CACHE_KEY, user)
+        frappe.local.ams_alumni_by_user = {}
+
+    drop()
+    frappe.db.after_commit.add(drop)
+
+# ============== INVALIDATION HOOKS ==============
+
+def on_alumni_update(doc, method=None):
+    """Alumni on_update: the mapping changes with the email; status changes
+    (deactivation) also drop it so nothing downstream keeps a stale copy"""
+    before = doc.get_doc_before_save()
+    if not before:
+        # New alumni: the user may be cached as having no record yet
+        invalidate_identity(doc.email)
+    elif before.email != doc.email or before.status != doc.status:
+        invalidate_identity(before.email, doc.email)
+
+def on_alumni_trash(doc, method=None):
+    """Alumni on_trash"""
+    invalidate_identity(doc.email)
+
+def on_alumni_rename(doc, method=None, old=None, new=None, merge=False):
+    """Alumni after_rename"""
+    invalidate_identity(doc.email)
@@ -0,0 +1,155 @@
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+# institution -> Active alumni in its whole subtree (itself + descendants)
+ROLLUP_KEY = "ams:institution_rollup"
+
+TREE_FIELDS = ["name", "institution_name", "institution_code", "institution_type",
+               "parent_institution", "is_group", "city", "country"]
+
+# ============== NESTED SET QUERIES ==============
+
+def get_bounds(institution):
+    """lft/rgt of an institution node"""
+    bounds = frappe.db.get_value("Institution", institution, ["lft", "rgt"], as_dict=True)
+    if not bounds:
+        raise frappe.DoesNotExistError(_("Institution {0} not found").format(institution))
+    return bounds
+
+def subtree_condition(institution, alumni_table=None):
+    """Alumni whose institution lies inside the node's lft/rgt range, as one
+    IN (sub-query) served by the lft/rgt index"""
+    bounds = get_bounds(institution)
+    alumni_table = alumni_table or frappe.qb.DocType("Alumni")
+    node = frappe.qb.DocType("Institution")
+
+    return alumni_table.institution.isin(
+        frappe.qb.from_(node)
+        .select(node.name)
+        .where((node.lft >= bounds.lft) & (node.rgt <= bounds.rgt))
+    )
+
+def count_alumni_in_subtree(institution):
+    """Active alumni of an institution and all its descendants, in one query"""
+    bounds = get_bounds(institution)
+    return frappe.db.sql(
+        """select count(*)
+        from `tabAlumni` alumni
+        join `tabInstitution` node on node.name = alumni.institution
+        where alumni.status = 'Active' and node.lft >= %s and node.rgt <= %s""",
+        (bounds.lft, bounds.rgt)
+    )[0][0]
+
+# ============== ROLLUP CACHE ==============
+
+def rebuild_rollup():
+    """Recompute subtree alumni counts for every node with a single range join"""
+    counts = frappe.db.sql(
+        """select parent.name, count(alumni.name)
+        from `tabInstitution` parent
+        join `tabInstitution` node on node.lft >= parent.lft and node.rgt <= parent.rgt
+        left join `tabAlumni` alumni on alumni.institution = node.name and alumni.status = 'Active'
+        group by parent.name"""
+    )
+
+    key = frappe.cache().make_key(ROLLUP_KEY)
+    pipe = frappe.cache().pipeline()
+    pipe.delete(key)
+    if counts:
+        pipe.hset(key, mapping={name: count for name, count in counts})
+    pipe.execute()
+
+    return dict(counts)
+
+def get_rollup(institutions):
+    """Cached {institution: subtree alumni count}, rebuilt when missing"""
+    institutions = list(institutions)
+    if not frappe.cache().exists(ROLLUP_KEY):
+        rollup = rebuild_rollup()
+        return {name: rollup.get(name, 0) for name in institutions}
+
+    if not institutions:
+        return {}
+
+    counts = frappe.cache().hmget(frappe.cache().make_key(ROLLUP_KEY), institutions)
+    return {name: cint(count) for name, count in zip(institutions, counts)}
+
+def invalidate_rollup():
+    """Drop the rollup (tree shape changed); the next read rebuilds it"""
+    frappe.cache().delete_value(ROLLUP_KEY)
+
+def adjust_rollup(institution, delta):
+    """Add delta to the node and all its ancestors"""
+    if not institution or not delta or not frappe.cache().exists(ROLLUP_KEY):
+        return
+
+    ancestors = frappe.db.sql(
+        """select parent.name
+        from `tabInstitution` node
+        join `tabInstitution` parent on parent.lft <= node.lft and parent.rgt >= node.rgt
+        where node.name = %s""",
+        institution
+    )
+
+    key = frappe.cache().make_key(ROLLUP_KEY)
+    pipe = frappe.cache().pipeline()
+    for (name,) in ancestors:
+        pipe.hincrby(key, name, delta)
+    pipe.execute()
+
+# ============== TREE ==============
+
+def get_tree(root=None):
+    """Active institutions nested under `root` (or all roots) with subtree alumni counts.
+
+    One query for the nodes (ordered by lft) plus one cache read for the counts."""
+    filters = {"status": "Active"}
+    if root:
+        bounds = get_bounds(root)
+        filters["lft"] = [">=", bounds.lft]
+        filters["rgt"] = ["<=", bounds.rgt]
+
+    nodes = frappe.get_list(
+        "Institution",
+        filters=filters,
+        fields=TREE_FIELDS,
+        order_by="lft asc"
+    )
+    counts = get_rollup([node.name for node in nodes])
+
+    by_name = {}
+    tree = []
+    for node in nodes:
+        node["alumni_count"] = counts.get(node.name, 0)
+        node["children"] = []
+        by_name[node.name] = node
+
+        parent = by_name.get(node.parent_institution)
+        if parent and node.name != root:
+            parent["children"].append(node)
+        else:
+            tree.append(node)
+
+    return tree
+
+# ============== HOOKS ==============
+
+def on_alumni_update(doc, method=None):
+    """Alumni on_update: move the alumni between subtrees when institution or status changes"""
+    before = doc.get_doc_before_save()
+    was = before.institution if before and before.status == "Active" else None
+    now = doc.institution if doc.status == "Active" else None
+
+    if was != now:
+        frappe.db.after_commit.add(lambda: (adjust_rollup(was, -1), adjust_rollup(now, 1)))
+
+def on_alumni_trash(doc, method=None):
+    """Alumni on_trash"""
+    if doc.status == "Active" and doc.institution:
+        frappe.db.after_commit.add(lambda: adjust_rollup(doc.institution, -1))
+
+def on_institution_change(doc, method=None):
+    """Institution on_update / on_trash / after_rename: the tree shape may have changed"""
+    invalidate_rollup()
+    frappe.db.after_commit.add(invalidate_rollup)
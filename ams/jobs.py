@@ -0,0 +1,118 @@
+import time
+import traceback
+
+import frappe
+from frappe.utils import cint, now
+
+LOCK_KEY = "ams:jobs:lock:{}"
+LOG_DOCTYPE = "AMS Job Run"
+
+# Locks outlive the time budget so a crashed worker cannot block a job for long
+LOCK_GRACE_SECONDS = 300
+DEFAULT_BUDGET = 1800  # seconds
+
+class JobContext:
+    """Per-run counters and budget, reachable from the task via frappe.local"""
+    def __init__(self, job, budget):
+        self.job = job
+        self.deadline = time.monotonic() + budget if budget else None
+        self.rows = 0
+        self.queries = 0
+        self.yielded = False
+
+def current_job():
+    return getattr(frappe.local, "ams_job", None)
+
+# ============== TASK HELPERS ==============
+
+def add_rows(count):
+    """Report rows processed by the running task (no-op outside the runner)"""
+    job = current_job()
+    if job:
+        job.rows += cint(count)
+
+def out_of_time():
+    """True once the running task has used its time budget.
+
+    Tasks check this between chunks and stop; their own persisted checkpoint
+    (e.g. reminder_sent_on) lets the re-queued run carry on from there."""
+    job = current_job()
+    if job and job.deadline and time.monotonic() >= job.deadline:
+        job.yielded = True
+        return True
+    return False
+
+# ============== LOCKING ==============
+
+def acquire_lock(job, ttl):
+    token = frappe.generate_hash(length=12)
+    if frappe.cache().set(frappe.cache().make_key(LOCK_KEY.format(job)), token, nx=True, ex=ttl):
+        return token
+
+def release_lock(job, token):
+    key = frappe.cache().make_key(LOCK_KEY.format(job))
+    value = frappe.cache().get(key)
+    if value and value.decode() == token:
+        frappe.cache().delete(key)
+
+# ============== RUNNER ==============
+
+def _session_queries():
+    """Statements sent so far on this worker's connection (MariaDB session counter).
+
+    Read from the server, so only this run's own connection is counted and
+    nothing in frappe.db has to be patched."""
+    return cint(frappe.db.sql("show session status like 'Questions'")[0][1])
+
+def log_run(job, status, started_on, duration, error=None):
+    frappe.get_doc({
+        "doctype": LOG_DOCTYPE,
+        "job": job.job,
+        "status": status,
+        "started_on": started_on,
+        "finished_on": now(),
+        "duration_seconds": round(duration, 3),
+        "rows_processed": job.rows,
+        "queries": job.queries,
+        "error": error
+    }).insert(ignore_permissions=True)
+    frappe.db.commit()
+
+def run_job(task, budget=DEFAULT_BUDGET):
+    """Run a task under a lock and a time budget and record it in the job-run log.
+
+    Overlapping runs are skipped; a run that used up its budget is logged as
+    Yielded and queued again to resume."""
+    job = JobContext(task, budget)
+    started_on = now()
+
+    token = acquire_lock(task, cint(budget) + LOCK_GRACE_SECONDS)
+    if not token:
+        log_run(job, "Skipped", started_on, 0)
+        return
+
+    started = time.monotonic()
+    frappe.local.ams_job = job
+    queries = _session_queries()
+    try:
+        result = frappe.get_attr(task)()
+        if not job.rows and isinstance(result, int):
+            job.rows = result
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        # The closing counter read is not part of the task
+        job.queries = _session_queries() - queries - 1
+        log_run(job, "Failed", started_on, time.monotonic() - started, traceback.format_exc())
+        raise
+    finally:
+        frappe.local.ams_job = None
+        release_lock(task, token)
+
+    job.queries = _session_queries() - queries - 1
+    log_run(job, "Yielded" if job.yielded else "Success", started_on, time.monotonic() - started)
+
+    if job.yielded:
+        # `method` is enqueue's own first parameter, hence `task`
+        frappe.enqueue("ams.jobs.run_job", queue="long", task=task, budget=budget,
+                       job_id=f"ams-job-{task}", deduplicate=True)
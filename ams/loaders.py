@@ -0,0 +1,82 @@
+import frappe
+
+AUTHOR_FIELDS = ["first_name", "last_name", "profile_picture"]
+EVENT_FIELDS = ["event_name", "event_date", "venue"]
+
+# ============== REQUEST-SCOPED BATCH LOADER ==============
+
+class BatchLoader:
+    """Collects document names and resolves them with a single IN (...) query.
+
+    Rows are memoized for the rest of the request (or background job), so
+    repeated lookups of the same record never go back to the database."""
+
+    def __init__(self, doctype, fields):
+        self.doctype = doctype
+        self.fields = list(fields)
+        self.cache = {}
+        self.pending = set()
+
+    def prime(self, names):
+        """Queue names to be fetched by the next load"""
+        self.pending.update(name for name in names if name and name not in self.cache)
+        return self
+
+    def load_many(self, names):
+        """Return {name: row} for every requested name, querying only the misses"""
+        names = [name for name in names if name]
+        self.prime(names)
+
+        if self.pending:
+            rows = frappe.get_all(
+                self.doctype,
+                filters={"name": ["in", list(self.pending)]},
+                fields=["name", *self.fields]
+            )
+            for row in rows:
+                self.cache[row.name] = row
+            # Remember misses too, so a deleted record is not queried again
+            for name in self.pending:
+                self.cache.setdefault(name, None)
+            self.pending.clear()
+
+        return {name: self.cache.get(name) for name in names}
+
+    def load(self, name):
+        """Return a single row (or None), batching it with anything already primed"""
+        return self.load_many([name]).get(name)
+
+def get_loader(doctype, fields):
+    """Get the loader for doctype/fields bound to the current request"""
+    if not hasattr(frappe.local, "ams_loaders"):
+        frappe.local.ams_loaders = {}
+
+    key = (doctype, tuple(fields))
+    if key not in frappe.local.ams_loaders:
+        frappe.local.ams_loaders[key] = BatchLoader(doctype, fields)
+
+    return frappe.local.ams_loaders[key]
+
+def clear_loaders():
+    """Drop all memoized rows (e.g. between batches of a long-running job)"""
+    frappe.local.ams_loaders = {}
+
+# ============== COMMON LOADERS ==============
+
+def alumni_loader(fields=None):
+    return get_loader("Alumni", fields or AUTHOR_FIELDS)
+
+def event_loader(fields=None):
+    return get_loader("AMS Event", fields or EVENT_FIELDS)
+
+def get_authors(alumni_ids):
+    """Resolve post authors in one query, formatted for API responses"""
+    rows = alumni_loader().load_many(alumni_ids)
+    authors = {}
+    for alumni_id, row in rows.items():
+        authors[alumni_id] = {
+            "id": alumni_id,
+            "name": f"{row.first_name} {row.last_name or ''}".strip() if row else None,
+            "profile_picture": row.profile_picture if row else None
+        }
+    return authors
@@ -0,0 +1,60 @@
+import frappe
+from frappe.utils import getdate, now, today
+
+from ams.conditional import bump_version
+from ams.jobs import add_rows, out_of_time
+
+EXPIRY_CHUNK_SIZE = 5000
+
+# ============== EFFECTIVE STATUS ==============
+
+def effective_status(status, expiry_date, on_date=None):
+    """Status as of `on_date` (default today): an Active membership past its
+    expiry date is Expired even if the nightly sweep has not reached it yet"""
+    if status == "Active" and expiry_date and getdate(expiry_date) < getdate(on_date or today()):
+        return "Expired"
+    return status
+
+# ============== EXPIRY SWEEP ==============
+
+def expire_memberships():
+    """Flip Active memberships past their expiry date to Expired with chunked
+    set-based UPDATEs, served by the (status, expiry_date) index.
+
+    No documents are loaded or saved; the side effects of the Membership
+    doc_events (profile cache, ETag versions) are applied once per chunk."""
+    # profiles imports this module for effective_status
+    from ams.profiles import invalidate_profile
+
+    expired = 0
+    while True:
+        rows = frappe.db.sql(
+            """select name, alumni
+            from `tabMembership`
+            where status = 'Active' and expiry_date < %(today)s
+            limit %(limit)s""",
+            {"today": today(), "limit": EXPIRY_CHUNK_SIZE},
+            as_dict=True
+        )
+        if not rows:
+            break
+
+        frappe.db.sql(
+            """update `tabMembership`
+            set status = 'Expired', modified = %(now)s
+            where name in %(names)s and status = 'Active'""",
+            {"now": now(), "names": tuple(row.name for row in rows)}
+        )
+
+        alumni = list({row.alumni for row in rows if row.alumni})
+        invalidate_profile(*alumni)
+        bump_version("Membership", *(f"Alumni:{alumni_id}" for alumni_id in alumni))
+        frappe.db.commit()
+
+        expired += len(rows)
+        add_rows(len(rows))
+
+        if out_of_time():
+            break
+
+    return expired
@@ -0,0 +1,151 @@
+import hashlib
+import json
+
+import frappe
+from frappe.utils import cint, now
+
+from ams.jobs import acquire_lock, release_lock
+
+OUTBOX_DOCTYPE = "AMS Outbox"
+BATCH_SIZE = 200
+MAX_ATTEMPTS = 5
+LOCK_TTL = 600  # seconds
+
+# Bump `version` whenever a template's text changes; compiled templates are
+# cached per (name, version) for the life of the worker
+TEMPLATES = {
+    "alumni_welcome": {
+        "version": 1,
+        "subject": "Welcome to Alumni Network!",
+        "message": """
+<p>Hi {{ first_name }}, welcome aboard!</p>
+{% if setup_link %}<p><a href="{{ setup_link }}">Set your password</a> to sign in.</p>{% endif %}
+"""
+    },
+    "donation_receipt": {
+        "version": 1,
+        "subject": "Donation Receipt - ₹{{ amount }}",
+        "message": """
+<p>Hi {{ donor_name }},</p>
+<p>Thank you for your donation of ₹{{ amount }}. Receipt attached.</p>
+"""
+    }
+}
+
+_compiled = {}
+
+# ============== ENQUEUE ==============
+
+def enqueue_email(template, recipient, reference_doctype, reference_name, context=None):
+    """Append an outbox row in the caller's transaction; nothing is rendered or sent here.
+
+    The same template/document/recipient is only ever queued once."""
+    if template not in TEMPLATES or not recipient:
+        return
+
+    timestamp = now()
+    try:
+        frappe.db.sql(
+            """insert into `tabAMS Outbox`
+                (name, creation, modified, owner, modified_by, template, recipient,
+                 reference_doctype, reference_name, context, dedupe_key, status, attempts)
+            values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'Queued', 0)""",
+            (
+                frappe.generate_hash(length=10), timestamp, timestamp, frappe.session.user, frappe.session.user,
+                template, recipient, reference_doctype, reference_name, json.dumps(context or {}, default=str),
+                dedupe_key(template, reference_doctype, reference_name, recipient)
+            )
+        )
+    except Exception as e:
+        # Only an already queued email is expected here; anything else is lost mail
+        if not frappe.db.is_unique_key_violation(e) or frappe.db.is_primary_key_violation(e):
+            raise
+        return
+
+    # Deliver soon after commit rather than waiting for the next scheduler tick
+    frappe.enqueue("ams.outbox.process_outbox", queue="short", enqueue_after_commit=True,
+                   job_id="ams-outbox", deduplicate=True)
+
+def dedupe_key(template, reference_doctype, reference_name, recipient):
+    """Fixed-length key for the unique index, however long its parts are"""
+    raw = json.dumps([template, reference_doctype, reference_name, recipient])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+# ============== RENDERING ==============
+
+def get_template(name):
+    """(subject, message) Jinja templates, compiled once per template version"""
+    template = TEMPLATES[name]
+    key = (name, template["version"])
+    if key not in _compiled:
+        env = frappe.get_jinja_env()
+        _compiled[key] = (env.from_string(template["subject"]), env.from_string(template["message"]))
+    return _compiled[key]
+
+def build_context(row):
+    context = json.loads(row.context or "{}")
+    if row.template == "alumni_welcome" and frappe.db.exists("User", row.recipient):
+        # Generated at send time so the link is fresh
+        context["setup_link"] = frappe.get_doc("User", row.recipient).reset_password()
+    return context
+
+# ============== WORKER ==============
+
+def process_outbox():
+    """Render and send queued emails in batches (scheduler + after-commit kick).
+
+    Each batch queues its mail and marks its rows in one transaction."""
+    token = acquire_lock("outbox", LOCK_TTL)
+    if not token:
+        return 0
+
+    # Walk the queue by (creation, name): rows that failed in this run stay
+    # Queued behind the cursor for the next run, not this one
+    processed, last = 0, ("", "")
+    try:
+        while rows := get_queued(*last):
+            send_batch(rows)
+            frappe.db.commit()
+            processed += len(rows)
+            last = (rows[-1].creation, rows[-1].name)
+    finally:
+        release_lock("outbox", token)
+
+    return processed
+
+def get_queued(after_creation="", after_name="", limit=BATCH_SIZE):
+    """Next batch of Queued rows after a (creation, name) keyset cursor"""
+    return frappe.db.sql(
+        """select name, creation, template, recipient, reference_doctype, reference_name, context, attempts
+        from `tabAMS Outbox`
+        where status = 'Queued'
+            and (creation > %(creation)s or (creation = %(creation)s and name > %(name)s))
+        order by creation, name
+        limit %(limit)s""",
+        {"creation": after_creation or "1970-01-01", "name": after_name, "limit": limit},
+        as_dict=True
+    )
+
+def send_batch(rows):
+    # Repeats for the same document are already refused by dedupe_key at enqueue
+    # time; identical text for different documents (two equal receipts) is real mail
+    for row in rows:
+        try:
+            subject, message = get_template(row.template)
+            context = build_context(row)
+            subject, message = subject.render(context), message.render(context)
+
+            frappe.sendmail(
+                recipients=[row.recipient],
+                subject=subject,
+                message=message,
+                reference_doctype=row.reference_doctype,
+                reference_name=row.reference_name
+            )
+            _mark(row.name, "Sent", sent_on=now())
+        except Exception as e:
+            attempts = cint(row.attempts) + 1
+            _mark(row.name, "Failed" if attempts >= MAX_ATTEMPTS else "Queued", attempts=attempts, error=str(e))
+
+def _mark(name, status, **values):
+    frappe.db.set_value(OUTBOX_DOCTYPE, name, dict(values, status=status), update_modified=True)
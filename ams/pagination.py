@@ -0,0 +1,210 @@
+import base64
+import hashlib
+import json
+
+import frappe
+from frappe import _
+from frappe.model.db_query import DatabaseQuery
+from frappe.query_builder import Order
+from frappe.query_builder.functions import Count
+from frappe.utils import cint
+from pypika.terms import LiteralValue
+
+MAX_PAGE_SIZE = 100
+COUNT_CACHE_TTL = 300  # seconds
+
+OPERATORS = {
+    "=": lambda column, value: column == value,
+    "!=": lambda column, value: column != value,
+    ">": lambda column, value: column > value,
+    ">=": lambda column, value: column >= value,
+    "<": lambda column, value: column < value,
+    "<=": lambda column, value: column <= value,
+    "like": lambda column, value: column.like(value),
+    "in": lambda column, value: column.isin(value),
+    "not in": lambda column, value: column.notin(value),
+    "is": lambda column, value: column.isnotnull() if value == "set" else column.isnull(),
+}
+
+# ============== CURSORS ==============
+
+def encode_cursor(values):
+    """Encode the sort-key values of the last row into an opaque cursor"""
+    raw = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor, order_by):
+    """Decode a cursor produced by encode_cursor for the given sort keys"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+
+    if not isinstance(values, list) or len(values) != len(order_by):
+        frappe.throw(_("Invalid pagination cursor"), frappe.ValidationError)
+
+    return values
+
+# ============== QUERY BUILDING ==============
+
+def normalize_order_by(order_by):
+    """Turn "a desc, b asc" or [("a", "desc")] into a list of (field, direction)
+    and append `name` as the final tie-breaker so every row has a unique key"""
+    if isinstance(order_by, str):
+        order_by = [part.split() for part in order_by.split(",")]
+
+    keys = []
+    for part in order_by:
+        field, direction = (part[0], part[1] if len(part) > 1 else "asc")
+        keys.append((field, direction.lower()))
+
+    if keys[-1][0] != "name":
+        keys.append(("name", keys[-1][1]))
+
+    return keys
+
+def _normalize_filters(filters):
+    """Yield (field, operator, value) triples from dict or list style filters"""
+    if not filters:
+        return
+
+    if isinstance(filters, dict):
+        for field, value in filters.items():
+            if isinstance(value, (list, tuple)):
+                yield field, value[0].lower(), value[1]
+            else:
+                yield field, "=", value
+        return
+
+    for f in filters:
+        # [doctype, field, operator, value] or [field, operator, value]
+        field, operator, value = f[-3:]
+        yield field, operator.lower(), value
+
+def build_conditions(table, filters=None, or_filters=None):
+    """Build a pypika criterion from frappe-style filters and or_filters"""
+    condition = None
+
+    for field, operator, value in _normalize_filters(filters):
+        criterion = OPERATORS[operator](table[field], value)
+        condition = criterion if condition is None else condition & criterion
+
+    any_of = None
+    for field, operator, value in _normalize_filters(or_filters):
+        criterion = OPERATORS[operator](table[field], value)
+        any_of = criterion if any_of is None else any_of | criterion
+
+    if any_of is not None:
+        condition = any_of if condition is None else condition & any_of
+
+    return condition
+
+def match_conditions(doctype):
+    """The session user's User Permission and permission-query restrictions,
+    as frappe.get_list would apply them, in SQL (or None when there are none)"""
+    condition = DatabaseQuery(doctype).build_match_conditions()
+    if condition:
+        # Queries run with parameters, so literal %s must be escaped
+        return "({})".format(condition.replace("%", "%%"))
+
+def keyset_condition(table, order_by, values):
+    """Rows strictly after `values` in `order_by` order:
+    k1 > v1 OR (k1 = v1 AND (k2 > v2 OR (k2 = v2 AND ...)))"""
+    condition = None
+    for (field, direction), value in reversed(list(zip(order_by, values))):
+        column = table[field]
+        after = column < value if direction == "desc" else column > value
+        condition = after if condition is None else after | ((column == value) & condition)
+
+    return condition
+
+# ============== COUNTS ==============
+
+def cached_count(doctype, key_parts, compute):
+    """Return compute() memoized in Redis for COUNT_CACHE_TTL seconds"""
+    key = "ams:count:{}:{}".format(doctype, hashlib.md5(frappe.as_json(key_parts).encode()).hexdigest())
+
+    cached = frappe.cache().get_value(key)
+    if cached is not None:
+        return cached
+
+    count = compute()
+    frappe.cache().set_value(key, count, expires_in_sec=COUNT_CACHE_TTL)
+    return count
+
+def get_count(doctype, filters=None, or_filters=None, conditions=None, extra_conditions=None):
+    """Cached row count for a filter set, so totals never need a full fetch"""
+    def compute():
+        table = frappe.qb.DocType(doctype)
+        query = frappe.qb.from_(table).select(Count("*"))
+        where = conditions if conditions is not None else build_conditions(table, filters, or_filters)
+        for criterion in [where, *(extra_conditions or [])]:
+            if criterion is not None:
+                query = query.where(criterion)
+        return query.run()[0][0]
+
+    key_parts = [filters, or_filters, [str(criterion) for criterion in extra_conditions or []]]
+    return cached_count(doctype, key_parts, compute)
+
+# ============== PAGES ==============
+
+def get_page(doctype, fields, filters=None, or_filters=None, order_by="modified desc",
+             page=1, page_size=20, cursor=None, with_total=True, extra_conditions=None):
+    """Fetch a single page with LIMIT pushed down to the database.
+
+    Pass `cursor` (the `next_cursor` of the previous page) for keyset
+    pagination, which stays O(page_size) however deep the page is.
+    Without a cursor, `page` is used as a classic offset.
+    `extra_conditions` takes pypika criteria that filters cannot express
+    (e.g. sub-queries); build them against frappe.qb.DocType(doctype)."""
+    frappe.has_permission(doctype, "read", throw=True)
+
+    # Row-level restrictions, the same ones frappe.get_list applies
+    match = match_conditions(doctype)
+    if match:
+        extra_conditions = [*(extra_conditions or []), LiteralValue(match)]
+
+    page = max(1, cint(page))
+    page_size = max(1, min(cint(page_size) or 20, MAX_PAGE_SIZE))
+    order_by = normalize_order_by(order_by)
+
+    table = frappe.qb.DocType(doctype)
+    select_fields = list(dict.fromkeys(list(fields) + [field for field, direction in order_by]))
+    query = frappe.qb.from_(table).select(*[table[field] for field in select_fields])
+
+    conditions = build_conditions(table, filters, or_filters)
+    for criterion in [conditions, *(extra_conditions or [])]:
+        if criterion is not None:
+            query = query.where(criterion)
+
+    if cursor:
+        query = query.where(keyset_condition(table, order_by, decode_cursor(cursor, order_by)))
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    for field, direction in order_by:
+        query = query.orderby(table[field], order=Order.desc if direction == "desc" else Order.asc)
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(page_size + 1).run(as_dict=True)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor([rows[-1][field] for field, direction in order_by])
+
+    extra_fields = set(select_fields) - set(fields)
+    if extra_fields:
+        for row in rows:
+            for field in extra_fields:
+                row.pop(field, None)
+
+    return {
+        "items": rows,
+        "page": page,
+        "page_size": page_size,
+        "total": get_count(doctype, filters, or_filters, conditions, extra_conditions) if with_total else None,
+        "has_more": has_more,
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,5 @@
+from ams.search import ensure_fulltext_index
+
+
+def execute():
+    ensure_fulltext_index()
@@ -0,0 +1,5 @@
+from ams.counters import repair_rsvp_counts
+
+
+def execute():
+    repair_rsvp_counts()
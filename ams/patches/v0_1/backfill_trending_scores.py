@@ -0,0 +1,5 @@
+from ams.trending import decay_scores
+
+
+def execute():
+    decay_scores()
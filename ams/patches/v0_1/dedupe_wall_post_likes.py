@@ -0,0 +1,13 @@
+import frappe
+
+from ams.counters import reconcile_like_counts
+
+
+def execute():
+    # Duplicate likes would block the unique (post, alumni) constraint
+    frappe.db.sql(
+        """delete dup from `tabWall Post Like` dup
+        join `tabWall Post Like` keep
+            on keep.post = dup.post and keep.alumni = dup.alumni and keep.name < dup.name"""
+    )
+    reconcile_like_counts()
@@ -0,0 +1,119 @@
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+from ams.memberships import effective_status
+
+PROFILE_CACHE_KEY = "ams:profile"
+HITS_KEY = "ams:profile:hits"
+MISSES_KEY = "ams:profile:misses"
+
+PROFILE_FIELDS = [
+    "name", "first_name", "last_name", "email", "phone", "institution",
+    "batch_year", "course", "job_title", "company", "bio",
+    "profile_picture", "linkedin_url", "location", "status", "joined_on"
+]
+
+# ============== PROFILE CACHE ==============
+
+def build_profile(alumni_id):
+    """Assemble the full profile card from the database"""
+    alumni = frappe.db.get_value("Alumni", alumni_id, PROFILE_FIELDS, as_dict=True)
+    if not alumni:
+        raise frappe.DoesNotExistError(_("Alumni {0} not found").format(alumni_id))
+
+    # Get posts count
+    posts_count = frappe.db.count("Wall Post", {"alumni": alumni.name, "status": "Published"})
+
+    # Get membership status
+    membership = frappe.db.get_value("Membership", {"alumni": alumni.name},
+                                     ["membership_type", "status", "expiry_date"])
+
+    return {
+        "id": alumni.name,
+        "first_name": alumni.first_name,
+        "last_name": alumni.last_name,
+        "email": alumni.email,
+        "phone": alumni.phone,
+        "institution": alumni.institution,
+        "batch_year": alumni.batch_year,
+        "course": alumni.course,
+        "job_title": alumni.job_title,
+        "company": alumni.company,
+        "bio": alumni.bio,
+        "profile_picture": alumni.profile_picture,
+        "linkedin_url": alumni.linkedin_url,
+        "location": alumni.location,
+        "status": alumni.status,
+        "joined_on": alumni.joined_on,
+        "posts_count": posts_count,
+        "membership": {
+            "type": membership[0],
+            "status": membership[1],
+            "expiry_date": membership[2]
+        } if membership else None
+    }
+
+def _count(key):
+    frappe.cache().incr(frappe.cache().make_key(key))
+
+def get_profile(alumni_id):
+    """Cached profile card; only a miss touches the database"""
+    profile = frappe.cache().hget(PROFILE_CACHE_KEY, alumni_id)
+    if profile is not None:
+        _count(HITS_KEY)
+    else:
+        _count(MISSES_KEY)
+        profile = build_profile(alumni_id)
+        frappe.cache().hset(PROFILE_CACHE_KEY, alumni_id, profile)
+
+    # A cached card can outlive the membership's expiry date
+    membership = profile.get("membership")
+    if membership:
+        membership["status"] = effective_status(membership["status"], membership["expiry_date"])
+    return profile
+
+def invalidate_profile(*alumni_ids):
+    """Drop cached profiles now and again after commit, so a reader racing the
+    transaction cannot leave a stale copy behind"""
+    alumni_ids = [alumni_id for alumni_id in alumni_ids if alumni_id]
+    if not alumni_ids:
+        return
+
+    def drop():
+        for alumni_id in alumni_ids:
+            frappe.cache().hdel(PROFILE_CACHE_KEY, alumni_id)
+
+    drop()
+    frappe.db.after_commit.add(drop)
+
+def get_cache_stats():
+    """Hit/miss counters for the profile cache"""
+    hits, misses = (
+        cint(value) for value in frappe.cache().mget([
+            frappe.cache().make_key(HITS_KEY),
+            frappe.cache().make_key(MISSES_KEY)
+        ])
+    )
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        "cached_profiles": len(frappe.cache().hkeys(PROFILE_CACHE_KEY))
+    }
+
+# ============== INVALIDATION HOOKS ==============
+
+def on_alumni_change(doc, method=None):
+    """Alumni on_update / on_trash"""
+    invalidate_profile(doc.name)
+
+def on_alumni_rename(doc, method=None, old=None, new=None, merge=False):
+    """Alumni after_rename"""
+    invalidate_profile(old, new)
+
+def on_linked_change(doc, method=None):
+    """Wall Post / Membership on_update / on_trash: refresh the owning alumni"""
+    before = doc.get_doc_before_save() if method == "on_update" else None
+    invalidate_profile(doc.alumni, before.alumni if before else None)
@@ -0,0 +1,143 @@
+import functools
+import math
+import time
+
+import frappe
+from frappe.utils import cint
+
+# endpoint -> dimension -> (requests, window in seconds); override per site with
+# "ams_rate_limits": {"login": {"ip": [60, 300]}} in site_config.json
+DEFAULT_LIMITS = {
+    "register_alumni": {"ip": (10, 3600), "email": (3, 3600)},
+    "login": {"ip": (30, 300), "email": (10, 300)},
+    "create_donation": {"ip": (20, 3600), "email": (10, 3600)}
+}
+
+WINDOW_KEY = "ams:ratelimit:{}:{}:{}:{}"
+METRICS_KEY = "ams:ratelimit:metrics"
+
+# In-process stand-in used only while Redis is unreachable: key -> [count, expires_at]
+_local_windows = {}
+
+class RateLimitExceeded(Exception):
+    def __init__(self, dimension, retry_after):
+        super().__init__(dimension)
+        self.dimension = dimension
+        self.retry_after = retry_after
+
+def get_limits(endpoint):
+    """Budgets for an endpoint, with site_config overrides (no database access)"""
+    limits = dict(DEFAULT_LIMITS.get(endpoint, {}))
+    limits.update((frappe.conf.get("ams_rate_limits") or {}).get(endpoint, {}))
+    return {dimension: (cint(limit[0]), cint(limit[1])) for dimension, limit in limits.items()}
+
+# ============== SLIDING WINDOW ==============
+
+def _hit_redis(keys, window):
+    current_key, previous_key = keys
+    pipe = frappe.cache().pipeline()
+    pipe.incr(current_key)
+    pipe.expire(current_key, window * 2)
+    pipe.get(previous_key)
+    current, _expire, previous = pipe.execute()
+    return cint(current), cint(previous)
+
+def _hit_local(keys, window):
+    current_key, previous_key = keys
+    now = time.monotonic()
+
+    # Same lifetime as the Redis keys; pruned on write so the dict stays bounded
+    for key in [key for key, (count, expires_at) in _local_windows.items() if expires_at <= now]:
+        del _local_windows[key]
+
+    entry = _local_windows.setdefault(current_key, [0, now + window * 2])
+    entry[0] += 1
+    return entry[0], _local_windows.get(previous_key, [0])[0]
+
+def hit(endpoint, dimension, identifier, limit, window):
+    """Count one request and check it against a sliding window.
+
+    The estimate weights the previous fixed window by how much of it still
+    overlaps the sliding one, which needs only two counters per key."""
+    now = time.time()
+    index = int(now // window)
+    elapsed = (now % window) / window
+    keys = [
+        frappe.cache().make_key(WINDOW_KEY.format(endpoint, dimension, identifier, i))
+        for i in (index, index - 1)
+    ]
+
+    try:
+        current, previous = _hit_redis(keys, window)
+    except Exception:
+        current, previous = _hit_local(keys, window)
+
+    estimate = previous * (1 - elapsed) + current
+    if estimate > limit:
+        raise RateLimitExceeded(dimension, math.ceil(window * (1 - elapsed)))
+
+def check(endpoint, identifiers):
+    """Raise RateLimitExceeded if any dimension (ip, email, ...) is over budget"""
+    limits = get_limits(endpoint)
+    try:
+        for dimension, identifier in identifiers.items():
+            if identifier and dimension in limits:
+                limit, window = limits[dimension]
+                hit(endpoint, dimension, str(identifier).strip().lower(), limit, window)
+    except RateLimitExceeded as e:
+        record_decision(endpoint, f"rejected:{e.dimension}")
+        raise
+
+    record_decision(endpoint, "allowed")
+
+# ============== METRICS ==============
+
+def record_decision(endpoint, decision):
+    try:
+        frappe.cache().hincrby(frappe.cache().make_key(METRICS_KEY), f"{endpoint}:{decision}", 1)
+    except Exception:
+        pass
+
+def get_metrics():
+    """{endpoint: {decision: count}} since the metrics were last reset"""
+    metrics = {}
+    fields = [f"{endpoint}:{decision}" for endpoint, limits in DEFAULT_LIMITS.items()
+              for decision in ["allowed", *[f"rejected:{dimension}" for dimension in limits]]]
+    values = frappe.cache().hmget(frappe.cache().make_key(METRICS_KEY), fields)
+
+    for field, value in zip(fields, values):
+        endpoint, decision = field.split(":", 1)
+        metrics.setdefault(endpoint, {})[decision] = cint(value)
+
+    return metrics
+
+# ============== DECORATOR ==============
+
+def rate_limited(endpoint, email_arg=None):
+    """Reject over-budget calls before the endpoint runs (and so before any
+    database access), keyed by client IP and, optionally, the target email"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            identifiers = {"ip": getattr(frappe.local, "request_ip", None)}
+            if email_arg:
+                identifiers["email"] = kwargs.get(email_arg)
+
+            try:
+                check(endpoint, identifiers)
+            except RateLimitExceeded as e:
+                from ams.api import error_response
+                from ams.conditional import set_response_header
+
+                set_response_header("Retry-After", str(e.retry_after))
+                return error_response(
+                    f"Too many requests. Try again in {e.retry_after} seconds.",
+                    "RATE_LIMITED",
+                    429
+                )
+
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,110 @@
+import time
+
+import frappe
+from frappe.utils import add_days, now, today
+
+from ams.jobs import add_rows, out_of_time
+
+# sendmail keeps up to 100 recipients in a single Email Queue row inserted in the
+# current transaction; larger lists are handed to a background job instead, which
+# would escape the per-chunk commit below
+CHUNK_SIZE = 100
+
+LAST_RUN_KEY = "ams:reminders:last_run"
+
+REMINDER_SUBJECT = "Reminder: {{ event.event_name }} is tomorrow!"
+REMINDER_MESSAGE = """
+<p>Hi,</p>
+<p>This is a reminder that <strong>{{ event.event_name }}</strong> is happening tomorrow!</p>
+<p><strong>Date:</strong> {{ event.event_date }}</p>
+<p><strong>Venue:</strong> {{ event.venue }}</p>
+<p>See you there!</p>
+"""
+
+# ============== SOURCES ==============
+
+def get_due_events():
+    """Upcoming AMS Events starting between now and the end of tomorrow"""
+    return frappe.get_all(
+        "AMS Event",
+        filters=[
+            ["AMS Event", "status", "=", "Upcoming"],
+            ["AMS Event", "event_date", ">=", now()],
+            ["AMS Event", "event_date", "<", add_days(today(), 2)]
+        ],
+        fields=["name", "event_name", "event_date", "venue"],
+        order_by="event_date asc"
+    )
+
+def get_pending_recipients(event, after="", limit=CHUNK_SIZE):
+    """Next chunk of Going RSVPs not yet reminded, joined to the attendee's email"""
+    return frappe.db.sql(
+        """select rsvp.name, alumni.email
+        from `tabEvent RSVP` rsvp
+        join `tabAlumni` alumni on alumni.name = rsvp.alumni
+        where rsvp.event = %(event)s
+            and rsvp.response_status = 'Going'
+            and rsvp.reminder_sent_on is null
+            and rsvp.name > %(after)s
+        order by rsvp.name
+        limit %(limit)s""",
+        {"event": event, "after": after, "limit": limit},
+        as_dict=True
+    )
+
+# ============== PIPELINE ==============
+
+def send_event_reminders():
+    """Queue reminders for every Going RSVP of tomorrow's events.
+
+    Each chunk queues its mail and stamps `reminder_sent_on` on its RSVPs in
+    the same transaction, so a crashed run resumes where it stopped without
+    resending or skipping anyone."""
+    started = time.monotonic()
+    metrics = {"started_on": now(), "events": 0, "chunks": 0, "recipients": 0}
+
+    for event in get_due_events():
+        # Rendered once per event, not once per recipient
+        subject = frappe.render_template(REMINDER_SUBJECT, {"event": event})
+        message = frappe.render_template(REMINDER_MESSAGE, {"event": event})
+        metrics["events"] += 1
+
+        after = ""
+        while rows := get_pending_recipients(event.name, after):
+            recipients = list(dict.fromkeys(row.email for row in rows if row.email))
+            if recipients:
+                frappe.sendmail(
+                    recipients=recipients,
+                    subject=subject,
+                    message=message,
+                    reference_doctype="AMS Event",
+                    reference_name=event.name
+                )
+
+            frappe.db.sql(
+                "update `tabEvent RSVP` set reminder_sent_on = %s where name in %s",
+                (now(), tuple(row.name for row in rows))
+            )
+            frappe.db.commit()
+
+            metrics["chunks"] += 1
+            metrics["recipients"] += len(recipients)
+            add_rows(len(rows))
+            after = rows[-1].name
+
+            if out_of_time():
+                break
+
+        if out_of_time():
+            break
+
+    duration = time.monotonic() - started
+    metrics["duration_seconds"] = round(duration, 3)
+    metrics["recipients_per_second"] = round(metrics["recipients"] / duration, 1) if duration else None
+    frappe.cache().set_value(LAST_RUN_KEY, metrics)
+
+    return metrics
+
+def get_last_run():
+    """Timing and throughput of the most recent reminder run"""
+    return frappe.cache().get_value(LAST_RUN_KEY)
@@ -0,0 +1,122 @@
+import frappe
+from frappe import _, throw
+from frappe.utils import cint, now
+
+class EventCapacityError(frappe.ValidationError):
+    pass
+
+# ============== SEAT RESERVATION ==============
+
+def seats_held(rsvp):
+    """Seats an RSVP occupies: the alumni plus their guests, only when Going"""
+    if not rsvp or rsvp.response_status != "Going":
+        return 0
+    return 1 + cint(rsvp.guests)
+
+def lock_event(event):
+    """Lock the event row for the rest of the transaction and return its seat counters.
+
+    Every reservation and promotion goes through this lock, so concurrent
+    RSVPs for the same event are serialized instead of all passing the
+    capacity check together."""
+    return frappe.db.get_value(
+        "AMS Event",
+        event,
+        ["max_capacity", "going_count", "guest_count", "waitlist_count"],
+        as_dict=True,
+        for_update=True
+    )
+
+def seats_taken(event):
+    return cint(event.going_count) + cint(event.guest_count)
+
+def reserve_seats(rsvp):
+    """Claim seats for a Going RSVP, or move it to the waitlist when the event is full.
+
+    Called from EventRSVP.before_save; the counters themselves are updated in
+    on_update while the event row is still locked."""
+    before = rsvp.get_doc_before_save()
+    held = seats_held(before) if before and before.event == rsvp.event else 0
+    extra = seats_held(rsvp) - held
+
+    if extra <= 0:
+        return
+
+    event = lock_event(rsvp.event)
+    if not event or not cint(event.max_capacity):
+        return
+
+    # Nobody may jump the queue while others are waiting, except the
+    # waitlisted RSVP that is being promoted right now
+    waiting = cint(event.waitlist_count) - (1 if before and before.response_status == "Waitlisted" else 0)
+    has_room = seats_taken(event) + extra <= cint(event.max_capacity)
+
+    if has_room and (rsvp.flags.from_waitlist or waiting <= 0):
+        return
+
+    if held:
+        # Already attending: don't give up their seat for extra guests
+        throw(_("Not enough seats left for {0} additional guest(s)").format(extra), EventCapacityError)
+
+    rsvp.response_status = "Waitlisted"
+    if not (before and before.response_status == "Waitlisted" and rsvp.waitlisted_on):
+        rsvp.waitlisted_on = now()
+
+def released_seats(before, after):
+    """Whether moving from `before` to `after` gives seats back to the event"""
+    if not before:
+        return False
+    if after and after.event == before.event:
+        return seats_held(after) < seats_held(before)
+    return seats_held(before) > 0
+
+# ============== WAITLIST ==============
+
+def promote_waitlist(event_name):
+    """Promote waitlisted RSVPs in order while seats are free"""
+    event = lock_event(event_name)
+    if not event or not cint(event.waitlist_count):
+        return []
+
+    capacity = cint(event.max_capacity)
+    free = capacity - seats_taken(event)
+
+    waitlisted = frappe.get_all(
+        "Event RSVP",
+        filters={"event": event_name, "response_status": "Waitlisted"},
+        fields=["name", "guests"],
+        order_by="waitlisted_on asc, name asc"
+    )
+
+    promoted = []
+    for row in waitlisted:
+        seats = 1 + cint(row.guests)
+        # Strict FIFO: stop at the first request that does not fit
+        if capacity and seats > free:
+            break
+
+        rsvp = frappe.get_doc("Event RSVP", row.name)
+        rsvp.response_status = "Going"
+        rsvp.flags.from_waitlist = True
+        rsvp.save(ignore_permissions=True)
+
+        free -= seats
+        promoted.append(rsvp.name)
+
+    return promoted
+
+def get_waitlist_position(rsvp_name):
+    """1-based position of a waitlisted RSVP, or None if it is not waiting"""
+    rsvp = frappe.db.get_value(
+        "Event RSVP", rsvp_name, ["event", "response_status", "waitlisted_on"], as_dict=True
+    )
+    if not rsvp or rsvp.response_status != "Waitlisted":
+        return None
+
+    ahead = frappe.db.sql(
+        """select count(*) from `tabEvent RSVP`
+        where `event` = %(event)s and response_status = 'Waitlisted'
+            and (waitlisted_on < %(waitlisted_on)s or (waitlisted_on = %(waitlisted_on)s and name < %(name)s))""",
+        {"event": rsvp.event, "waitlisted_on": rsvp.waitlisted_on, "name": rsvp_name}
+    )[0][0]
+    return ahead + 1
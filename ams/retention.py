@@ -0,0 +1,144 @@
+import time
+
+import frappe
+from frappe.query_builder.functions import Count
+from frappe.utils import add_days, cint, flt, today
+
+from ams.conditional import bump_version
+from ams.jobs import add_rows, out_of_time
+from ams.pagination import build_conditions
+
+# Rows deleted per transaction and the pause between chunks, to bound lock time
+# and replication lag; override with ams_retention_chunk_size / ams_retention_pause
+CHUNK_SIZE = 500
+PAUSE_SECONDS = 0.5
+
+# Retention per AMS doctype. `days` is the age (by `date_field`) after which
+# rows matching `filters` are purged, None keeps them forever; `children` are
+# (doctype, link field) pairs deleted along with each chunk; `orphans_of`
+# purges rows whose (doctype, link field) parent no longer exists.
+# Override per site with "ams_retention_policies": {"Donation": {"days": 730}}.
+POLICIES = {
+    "Wall Post": {
+        "days": 365,
+        "date_field": "published_on",
+        "filters": {"status": "Archived"},
+        "children": [("Wall Post Like", "post")]
+    },
+    "Wall Post Like": {"orphans_of": ("Wall Post", "post")},
+    "AMS Event": {
+        "days": None,
+        "date_field": "event_date",
+        "filters": {"status": ["in", ["Completed", "Cancelled"]]},
+        "children": [("Event RSVP", "event")]
+    },
+    "Event RSVP": {"orphans_of": ("AMS Event", "event")},
+    "Membership": {
+        "days": None,
+        "date_field": "expiry_date",
+        "filters": {"status": ["in", ["Expired", "Cancelled"]]}
+    },
+    "Donation": {"days": None, "date_field": "donation_date", "filters": {"status": "Failed"}},
+    "AMS Monthly Stats": {"days": None, "date_field": "period"},
+    "AMS Job Run": {"days": 90, "date_field": "started_on"},
+    "AMS Outbox": {"days": 30, "date_field": "creation", "filters": {"status": ["in", ["Sent", "Skipped"]]}},
+    # Master data is never purged automatically
+    "Alumni": None,
+    "Course": None,
+    "Institution": None,
+    "Institution Type": None
+}
+
+def get_policies():
+    """Default policies merged with site_config overrides"""
+    overrides = frappe.conf.get("ams_retention_policies") or {}
+    policies = {}
+    for doctype, policy in POLICIES.items():
+        if doctype in overrides:
+            policy = dict(policy or {}, **(overrides[doctype] or {})) if overrides[doctype] is not None else None
+        policies[doctype] = policy
+    return policies
+
+def is_active(policy):
+    return bool(policy) and (policy.get("days") is not None or bool(policy.get("orphans_of")))
+
+# ============== SELECTION ==============
+
+def candidate_query(doctype, policy):
+    """Names of the rows a policy would purge"""
+    table = frappe.qb.DocType(doctype)
+    query = frappe.qb.from_(table).select(table.name)
+
+    conditions = build_conditions(table, policy.get("filters"), None)
+    if conditions is not None:
+        query = query.where(conditions)
+
+    if policy.get("days") is not None:
+        query = query.where(table[policy["date_field"]] < add_days(today(), -cint(policy["days"])))
+
+    if policy.get("orphans_of"):
+        parent_doctype, link_field = policy["orphans_of"]
+        parent = frappe.qb.DocType(parent_doctype)
+        query = query.where(
+            table[link_field].isnull() | table[link_field].notin(frappe.qb.from_(parent).select(parent.name))
+        )
+
+    return query
+
+def count_candidates(doctype, policy):
+    """Dry run: rows (and child rows) the policy would delete right now"""
+    candidates = candidate_query(doctype, policy)
+    table = frappe.qb.DocType(doctype)
+    counts = {doctype: frappe.qb.from_(table).select(Count("*")).where(table.name.isin(candidates)).run()[0][0]}
+
+    for child_doctype, link_field in policy.get("children") or []:
+        child = frappe.qb.DocType(child_doctype)
+        counts[child_doctype] = frappe.qb.from_(child).select(Count("*")).where(
+            child[link_field].isin(candidate_query(doctype, policy))
+        ).run()[0][0]
+
+    return counts
+
+# ============== DELETION ==============
+
+def purge(doctype, policy, chunk_size=None, pause=None):
+    """Delete a policy's rows chunk by chunk; children go with one DELETE per chunk"""
+    chunk_size = cint(chunk_size or frappe.conf.get("ams_retention_chunk_size") or CHUNK_SIZE)
+    pause = flt(frappe.conf.get("ams_retention_pause", PAUSE_SECONDS) if pause is None else pause)
+    children = policy.get("children") or []
+    deleted = dict.fromkeys([doctype, *(child for child, link_field in children)], 0)
+
+    while True:
+        names = candidate_query(doctype, policy).limit(chunk_size).run(pluck=True)
+        if not names:
+            break
+
+        for child_doctype, link_field in children:
+            child = frappe.qb.DocType(child_doctype)
+            deleted[child_doctype] += frappe.db.count(child_doctype, {link_field: ["in", names]})
+            frappe.qb.from_(child).delete().where(child[link_field].isin(names)).run()
+
+        table = frappe.qb.DocType(doctype)
+        frappe.qb.from_(table).delete().where(table.name.isin(names)).run()
+        deleted[doctype] += len(names)
+
+        bump_version(doctype, *deleted)
+        frappe.db.commit()
+        add_rows(len(names))
+
+        if len(names) < chunk_size or out_of_time():
+            break
+        time.sleep(pause)
+
+    return deleted
+
+def run_retention(dry_run=False, doctypes=None):
+    """Apply every active retention policy; with dry_run only count"""
+    report = {}
+    for doctype, policy in get_policies().items():
+        if (doctypes and doctype not in doctypes) or not is_active(policy):
+            continue
+        report[doctype] = count_candidates(doctype, policy) if dry_run else purge(doctype, policy)
+        if out_of_time():
+            break
+    return report
@@ -0,0 +1,165 @@
+import re
+
+import frappe
+from frappe.utils import cint
+
+from ams.pagination import MAX_PAGE_SIZE, cached_count, decode_cursor, encode_cursor, match_conditions
+
+SEARCH_FIELDS = ["first_name", "last_name", "company", "job_title"]
+INDEX_NAME = "alumni_fulltext"
+
+# Shorter tokens are not indexed by InnoDB (innodb_ft_min_token_size = 3)
+MIN_TOKEN_LENGTH = 3
+
+FILTER_FIELDS = ["institution", "batch_year", "course", "company"]
+
+# Result order, and the keys a cursor carries
+CURSOR_KEYS = ["relevance", "modified", "name"]
+
+# Full-text relevance moves with table-wide statistics as rows change; ranking
+# and cursors use it rounded to this many decimals so saved cursors stay valid
+RELEVANCE_PRECISION = 1
+
+RESULT_FIELDS = ["name", "first_name", "last_name", "institution", "batch_year", "job_title",
+                 "company", "profile_picture", "location"]
+
+# Response keys a caller may ask for: the columns plus the computed relevance
+RESPONSE_FIELDS = [*RESULT_FIELDS, "relevance"]
+
+# ============== INDEX MANAGEMENT ==============
+
+def has_fulltext_index():
+    """Check whether the Alumni FULLTEXT index exists"""
+    return bool(frappe.db.sql(
+        "show index from `tabAlumni` where Key_name = %s", INDEX_NAME
+    ))
+
+def ensure_fulltext_index():
+    """Create the FULLTEXT index over the searchable Alumni columns"""
+    if has_fulltext_index():
+        return False
+
+    columns = ", ".join(f"`{field}`" for field in SEARCH_FIELDS)
+    frappe.db.sql_ddl(f"alter table `tabAlumni` add fulltext index `{INDEX_NAME}` ({columns})")
+    return True
+
+def rebuild_index():
+    """Rebuild the Alumni search index from existing rows"""
+    if has_fulltext_index():
+        frappe.db.sql_ddl(f"alter table `tabAlumni` drop index `{INDEX_NAME}`")
+
+    ensure_fulltext_index()
+
+# ============== QUERYING ==============
+
+def tokenize(query):
+    """Split a free-text query into lowercase word tokens"""
+    return [token for token in re.split(r"[^\w]+", (query or "").lower()) if token]
+
+def build_match_expression(tokens):
+    """Boolean-mode expression requiring every token, prefix-matched so
+    partially typed words still hit: "jane acm" -> "+jane* +acm*" """
+    return " ".join(f"+{token}*" for token in tokens)
+
+def search(query, filters=None, page=1, page_size=20, fields=None, cursor=None):
+    """Relevance-ranked Alumni search combined with exact-match filters.
+
+    `filters` maps Alumni columns to values; `company` is matched as a
+    substring to keep parity with the directory filter. `fields` narrows the
+    response to a subset of RESPONSE_FIELDS. Pass `cursor` (the
+    `next_cursor` of the previous page) to page by keyset instead of `page`."""
+    frappe.has_permission("Alumni", "read", throw=True)
+
+    page = max(1, cint(page))
+    page_size = max(1, min(cint(page_size) or 20, MAX_PAGE_SIZE))
+    filters = {field: value for field, value in (filters or {}).items() if field in FILTER_FIELDS}
+
+    conditions = ["`status` = 'Active'"]
+    values = {}
+
+    # Row-level restrictions, the same ones frappe.get_list applies
+    match = match_conditions("Alumni")
+    if match:
+        conditions.append(match)
+
+    for field, value in filters.items():
+        if value in (None, ""):
+            continue
+        if field == "company":
+            conditions.append("`company` like %(company)s")
+            values["company"] = f"%{value}%"
+        else:
+            conditions.append(f"`{field}` = %({field})s")
+            values[field] = value
+
+    tokens = tokenize(query)
+    ranked = [token for token in tokens if len(token) >= MIN_TOKEN_LENGTH]
+    short = [token for token in tokens if len(token) < MIN_TOKEN_LENGTH]
+
+    if ranked:
+        match = "match({}) against (%(match)s in boolean mode)".format(
+            ", ".join(f"`{field}`" for field in SEARCH_FIELDS)
+        )
+        values["match"] = build_match_expression(ranked)
+        conditions.append(match)
+        relevance = f"round({match}, {RELEVANCE_PRECISION})"
+    else:
+        relevance = "0"
+
+    # Tokens too short for the full-text index fall back to prefix LIKEs. These
+    # are not index lookups: with a full-text token they only filter its
+    # matches, on their own they scan the active rows
+    for i, token in enumerate(short):
+        key = f"short_{i}"
+        values[key] = f"{token}%"
+        conditions.append("({})".format(" or ".join(f"`{field}` like %({key})s" for field in SEARCH_FIELDS)))
+
+    where = " and ".join(conditions)
+    columns = ", ".join(f"`{field}`" for field in RESULT_FIELDS if not fields or field in fields)
+
+    page_values = dict(values, limit=page_size + 1, offset=(page - 1) * page_size)
+    keyset = ""
+    if cursor:
+        # Rows after the cursor in (relevance desc, modified desc, name asc) order
+        page_values.update(zip(["after_relevance", "after_modified", "after_name"],
+                               decode_cursor(cursor, CURSOR_KEYS)))
+        page_values["offset"] = 0
+        keyset = f"""and ({relevance} < %(after_relevance)s or ({relevance} = %(after_relevance)s
+            and (`modified` < %(after_modified)s or (`modified` = %(after_modified)s
+            and `name` > %(after_name)s))))"""
+
+    rows = frappe.db.sql(
+        f"""select {columns}, `modified`, {relevance} as relevance
+        from `tabAlumni`
+        where {where} {keyset}
+        order by relevance desc, `modified` desc, `name` asc
+        limit %(limit)s offset %(offset)s""",
+        page_values,
+        as_dict=True
+    )
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor([rows[-1][key] for key in CURSOR_KEYS])
+
+    # `modified` is selected only for the cursor, `relevance` unless requested
+    for row in rows:
+        row.pop("modified", None)
+        if fields and "relevance" not in fields:
+            row.pop("relevance", None)
+
+    total = cached_count("Alumni", ["search", where, values], lambda: frappe.db.sql(
+        f"select count(*) from `tabAlumni` where {where}", values
+    )[0][0])
+
+    return {
+        "items": rows,
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "has_more": has_more,
+        "next_cursor": next_cursor
+    }
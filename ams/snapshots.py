@@ -0,0 +1,112 @@
+import frappe
+from frappe.utils import add_months, cint, flt, get_first_day, getdate, now, today
+
+SNAPSHOT_DOCTYPE = "AMS Monthly Stats"
+METRICS = ["new_alumni", "new_posts", "total_donations", "donation_count"]
+
+# One grouped pass per source table; each yields (period, metric values...)
+SOURCES = {
+    ("new_alumni",): """select date_format(joined_on, '%%Y-%%m-01'), count(*)
+        from `tabAlumni`
+        where joined_on >= %(from_date)s and joined_on < %(to_date)s
+        group by 1""",
+    ("new_posts",): """select date_format(published_on, '%%Y-%%m-01'), count(*)
+        from `tabWall Post`
+        where status = 'Published' and published_on >= %(from_date)s and published_on < %(to_date)s
+        group by 1""",
+    ("total_donations", "donation_count"): """select date_format(donation_date, '%%Y-%%m-01'), sum(amount), count(*)
+        from `tabDonation`
+        where status = 'Completed' and donation_date >= %(from_date)s and donation_date < %(to_date)s
+        group by 1"""
+}
+
+# ============== ROLLUP ==============
+
+def compute_months(from_date, to_date):
+    """{period: {metric: value}} for every month in [from_date, to_date)"""
+    values = {"from_date": str(from_date), "to_date": str(to_date)}
+    months = {}
+
+    period = getdate(from_date)
+    while period < getdate(to_date):
+        months[str(period)] = dict.fromkeys(METRICS, 0)
+        period = add_months(period, 1)
+
+    for metrics, query in SOURCES.items():
+        for period, *totals in frappe.db.sql(query, values):
+            if period in months:
+                months[period].update(zip(metrics, totals))
+
+    return months
+
+def save_months(months):
+    """Upsert snapshot rows in a single statement"""
+    if not months:
+        return
+
+    timestamp = now()
+    rows = [
+        (period, timestamp, timestamp, "Administrator", "Administrator", period, timestamp,
+         cint(stats["new_alumni"]), cint(stats["new_posts"]), flt(stats["total_donations"]),
+         cint(stats["donation_count"]))
+        for period, stats in months.items()
+    ]
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(rows))
+
+    frappe.db.sql(
+        f"""insert into `tab{SNAPSHOT_DOCTYPE}`
+            (name, creation, modified, owner, modified_by, period, generated_on,
+             new_alumni, new_posts, total_donations, donation_count)
+        values {placeholders}
+        on duplicate key update
+            modified = values(modified), generated_on = values(generated_on),
+            new_alumni = values(new_alumni), new_posts = values(new_posts),
+            total_donations = values(total_donations), donation_count = values(donation_count)""",
+        [value for row in rows for value in row]
+    )
+
+def rollup_months(from_date, to_date=None):
+    """Recompute and store snapshots for the months from `from_date` up to the current one"""
+    from_date = get_first_day(from_date)
+    to_date = get_first_day(to_date) if to_date else add_months(get_first_day(today()), 1)
+
+    months = compute_months(from_date, to_date)
+    save_months(months)
+    frappe.db.commit()
+    return months
+
+def rollup_recent():
+    """Daily: refresh the current month and finalize the previous one"""
+    return rollup_months(add_months(today(), -1))
+
+def backfill():
+    """Snapshot every month since the oldest alumni, post or donation"""
+    oldest = frappe.db.sql(
+        """select least(
+            coalesce((select min(joined_on) from `tabAlumni`), curdate()),
+            coalesce((select min(published_on) from `tabWall Post` where status = 'Published'), curdate()),
+            coalesce((select min(donation_date) from `tabDonation` where status = 'Completed'), curdate())
+        )"""
+    )[0][0]
+    return rollup_months(oldest)
+
+# ============== READS ==============
+
+def get_series(from_date=None, to_date=None):
+    """Trend series over stored snapshots only; the raw tables are not scanned.
+
+    Defaults to the last twelve months."""
+    to_date = get_first_day(to_date or today())
+    from_date = get_first_day(from_date or add_months(to_date, -11))
+
+    rows = frappe.get_all(
+        SNAPSHOT_DOCTYPE,
+        filters=[["period", ">=", from_date], ["period", "<=", to_date]],
+        fields=["period", *METRICS],
+        order_by="period asc"
+    )
+
+    series = {"periods": [str(row.period) for row in rows]}
+    for metric in METRICS:
+        series[metric] = [row[metric] for row in rows]
+    return series
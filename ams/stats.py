@@ -0,0 +1,113 @@
+import frappe
+from frappe.utils import cint, flt, get_datetime, now, now_datetime
+
+# Counters live in a plain Redis hash so they can be bumped with HINCRBYFLOAT;
+# the refresh timestamps go through the regular (pickled) cache API
+STATS_KEY = "ams:stats"
+UPDATED_ON_KEY = "ams:stats:updated_on"
+REFRESHED_ON_KEY = "ams:stats:refreshed_on"
+
+STAT_FIELDS = ["total_alumni", "total_posts", "total_donations", "total_donors", "upcoming_events"]
+
+# What a single document contributes to the landing page numbers
+CONTRIBUTIONS = {
+    "Alumni": lambda doc: {"total_alumni": 1} if doc.status == "Active" else {},
+    "Wall Post": lambda doc: {"total_posts": 1} if doc.status == "Published" else {},
+    "Donation": lambda doc: {
+        "total_donations": flt(doc.amount),
+        "total_donors": 1
+    } if doc.status == "Completed" else {},
+    "AMS Event": lambda doc: {
+        "upcoming_events": 1
+    } if doc.event_date and get_datetime(doc.event_date) >= now_datetime() else {}
+}
+
+def _key():
+    return frappe.cache().make_key(STATS_KEY)
+
+# ============== FULL REFRESH ==============
+
+def compute_stats():
+    """Full COUNT/SUM scan over the source tables"""
+    donations = frappe.db.sql(
+        "select coalesce(sum(amount), 0), count(*) from `tabDonation` where status = 'Completed'"
+    )[0]
+
+    return {
+        "total_alumni": frappe.db.count("Alumni", {"status": "Active"}),
+        "total_posts": frappe.db.count("Wall Post", {"status": "Published"}),
+        "total_donations": flt(donations[0]),
+        "total_donors": cint(donations[1]),
+        "upcoming_events": frappe.db.count(
+            "AMS Event",
+            filters=[["AMS Event", "event_date", ">=", now()]]
+        )
+    }
+
+def recompute_stats():
+    """Rebuild the stats store from scratch, correcting any incremental drift"""
+    stats = compute_stats()
+
+    pipe = frappe.cache().pipeline()
+    pipe.delete(_key())
+    pipe.hset(_key(), mapping=stats)
+    pipe.execute()
+
+    timestamp = now()
+    frappe.cache().set_value(REFRESHED_ON_KEY, timestamp)
+    frappe.cache().set_value(UPDATED_ON_KEY, timestamp)
+    return stats
+
+def get_stats():
+    """O(1) read of the materialized stats, with their freshness"""
+    values = frappe.cache().hmget(_key(), STAT_FIELDS)
+
+    if any(value is None for value in values):
+        stats = recompute_stats()
+    else:
+        stats = {field: flt(value) for field, value in zip(STAT_FIELDS, values)}
+        for field in STAT_FIELDS:
+            if field != "total_donations":
+                stats[field] = cint(stats[field])
+
+    stats["as_of"] = frappe.cache().get_value(UPDATED_ON_KEY)
+    stats["last_full_refresh"] = frappe.cache().get_value(REFRESHED_ON_KEY)
+    return stats
+
+# ============== INCREMENTAL UPDATES ==============
+
+def apply_deltas(deltas):
+    """Bump counters in place; a missing store is left for the next read to rebuild"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas or not frappe.cache().exists(STATS_KEY):
+        return
+
+    pipe = frappe.cache().pipeline()
+    for field, delta in deltas.items():
+        pipe.hincrbyfloat(_key(), field, delta)
+    pipe.execute()
+
+    frappe.cache().set_value(UPDATED_ON_KEY, now())
+
+def track_change(before, after):
+    """Queue the difference between two versions of a document, applied on commit"""
+    doc = after or before
+    contribution = CONTRIBUTIONS.get(doc.doctype)
+    if not contribution:
+        return
+
+    removed = contribution(before) if before else {}
+    added = contribution(after) if after else {}
+    deltas = {field: added.get(field, 0) - removed.get(field, 0) for field in set(removed) | set(added)}
+
+    if any(deltas.values()):
+        # Only count changes that actually land in the database
+        frappe.db.after_commit.add(lambda: apply_deltas(deltas))
+
+def on_doc_update(doc, method=None):
+    """doc_events hook for on_update"""
+    track_change(doc.get_doc_before_save(), doc)
+
+def on_doc_trash(doc, method=None):
+    """doc_events hook for on_trash"""
+    track_change(doc, None)
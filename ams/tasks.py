@@ -0,0 +1,25 @@
+from ams.jobs import run_job
+
+# Scheduler entry points: each maintenance task in ams.utils runs through the
+# instrumented runner (lock, time budget, AMS Job Run log)
+
+def send_event_reminders():
+    run_job("ams.utils.send_event_reminders", budget=600)
+
+def update_expired_memberships():
+    run_job("ams.utils.update_expired_memberships", budget=900)
+
+def send_membership_expiry_notifications():
+    run_job("ams.utils.send_membership_expiry_notifications", budget=900)
+
+def generate_monthly_stats():
+    run_job("ams.utils.generate_monthly_stats", budget=300)
+
+def notify_admin_of_pending_posts():
+    run_job("ams.utils.notify_admin_of_pending_posts", budget=300)
+
+def cleanup_old_data():
+    run_job("ams.utils.cleanup_old_data", budget=1800)
+
+def send_monthly_digest():
+    run_job("ams.utils.send_monthly_digest", budget=900)
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+
+class AlumniTestCase(FrappeTestCase):
+	"""Test case with a private namespace of Alumni rows.
+
+	Every email starts with `self.prefix`, so tearDown can remove the alumni
+	and the welcome mail their inserts queue. frappe.enqueue is patched
+	(`self.enqueue`): inserts kick the outbox worker after commit, which
+	would otherwise run outside the test."""
+
+	def setUp(self):
+		self.enqueue = patch("frappe.enqueue").start()
+		self.addCleanup(patch.stopall)
+		self.prefix = f"test-{frappe.generate_hash(length=8)}-"
+		self.alumni_count = 0
+
+	def tearDown(self):
+		frappe.db.delete("Alumni", {"name": ["like", f"{self.prefix}%"]})
+		frappe.db.delete("AMS Outbox", {"recipient": ["like", f"{self.prefix}%"]})
+		frappe.db.commit()
+
+	def make_alumni(self, count, **values):
+		"""Insert `count` alumni (Active, batch 2020 unless overridden) and return their names"""
+		names = []
+		for _ in range(count):
+			self.alumni_count += 1
+			alumni = frappe.get_doc({
+				"doctype": "Alumni",
+				"first_name": f"Test {self.alumni_count}",
+				"email": f"{self.prefix}{self.alumni_count}@example.com",
+				"batch_year": 2020,
+				**values
+			}).insert(ignore_permissions=True, ignore_links=True)
+			names.append(alumni.name)
+		return names
@@ -0,0 +1,176 @@
+import frappe
+from frappe.utils import add_days, cint, flt, get_datetime, now
+
+from ams.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+
+# A post is pushed to one timeline per audience segment of its author
+SEGMENT_FIELDS = ["batch_year", "course", "institution"]
+
+# Sorted sets of post names scored by published_on (epoch seconds)
+TIMELINE_KEY = "ams:timeline:{}:{}"
+SEGMENTS_KEY = "ams:timeline:segments"
+
+# Newest entries kept per segment, and how far back a timeline reaches
+MAX_TIMELINE_LENGTH = 500
+TIMELINE_DAYS = 90
+
+BACKFILL_CHUNK_SIZE = 1000
+
+def _key(name):
+    return frappe.cache().make_key(name)
+
+def _score(published_on):
+    return get_datetime(published_on).timestamp()
+
+def segment_keys(alumni):
+    """Timeline names for an alumni row carrying SEGMENT_FIELDS"""
+    return [
+        TIMELINE_KEY.format(field, alumni.get(field))
+        for field in SEGMENT_FIELDS
+        if alumni and alumni.get(field)
+    ]
+
+def get_segments(alumni_id):
+    return segment_keys(frappe.db.get_value("Alumni", alumni_id, SEGMENT_FIELDS, as_dict=True))
+
+# ============== FAN-OUT ON WRITE ==============
+
+def push(entries):
+    """Add (segment keys, post, published_on) entries and trim each touched timeline"""
+    touched = set()
+    pipe = frappe.cache().pipeline()
+    for keys, post, published_on in entries:
+        for key in keys:
+            pipe.zadd(_key(key), {post: _score(published_on)})
+            touched.add(key)
+
+    for key in touched:
+        pipe.zremrangebyrank(_key(key), 0, -(MAX_TIMELINE_LENGTH + 1))
+    pipe.execute()
+
+    if touched:
+        # Registry of (prefixed) timeline keys for trimming and rebuilds
+        frappe.cache().sadd(SEGMENTS_KEY, *[_key(key) for key in touched])
+
+def fan_out(post):
+    """Push a freshly published post to its author's segments once the transaction commits"""
+    keys = get_segments(post.alumni)
+    if keys:
+        entry = (keys, post.name, post.published_on)
+        frappe.db.after_commit.add(lambda: push([entry]))
+
+def withdraw(post):
+    """Remove an unpublished or deleted post from its author's segments.
+
+    Entries left behind in segments the author has since moved out of are
+    harmless: reads only return posts that are still published."""
+    keys = get_segments(post.alumni)
+    name = post.name
+
+    def remove():
+        pipe = frappe.cache().pipeline()
+        for key in keys:
+            pipe.zrem(_key(key), name)
+        pipe.execute()
+
+    if keys:
+        frappe.db.after_commit.add(remove)
+
+# ============== READS ==============
+
+def get_timeline(alumni_id, page_size=20, cursor=None, fields=None):
+    """Newest published posts from the alumni's own segments.
+
+    Each segment is read with one ZREVRANGEBYSCORE (pipelined) and the lists
+    are merged in memory, so no join runs on the request path. `cursor` is the
+    `next_cursor` of the previous page: the (score, name) of its last post,
+    so posts sharing that score are neither skipped nor repeated."""
+    page_size = max(1, min(cint(page_size) or 20, MAX_PAGE_SIZE))
+    keys = get_segments(alumni_id)
+
+    upper, last = "+inf", None
+    if cursor:
+        score, name = decode_cursor(cursor, ["score", "name"])
+        last = (flt(score), name)
+        upper = "({!r}".format(last[0])
+
+    pipe = frappe.cache().pipeline()
+    for key in keys:
+        if last:
+            # Ties with the last post are few (same second), so read them whole
+            pipe.zrangebyscore(_key(key), last[0], last[0], withscores=True)
+        pipe.zrevrangebyscore(_key(key), upper, "-inf", start=0, num=page_size + 1, withscores=True)
+
+    merged = {}
+    for entries in pipe.execute() if keys else []:
+        for post, score in entries:
+            post = post.decode() if isinstance(post, bytes) else post
+            # Same order as the ranking below: (score, name) descending
+            if last and (score, post) >= last:
+                continue
+            merged[post] = score
+
+    ranked = sorted(merged.items(), key=lambda entry: (entry[1], entry[0]), reverse=True)
+    has_more = len(ranked) > page_size
+    ranked = ranked[:page_size]
+
+    posts = {}
+    if ranked:
+        rows = frappe.get_list(
+            "Wall Post",
+            filters={"name": ["in", [post for post, score in ranked]], "status": "Published"},
+            fields=list(dict.fromkeys(["name", *(fields or ["title", "content", "alumni", "featured_image",
+                                                           "likes_count", "published_on"])])),
+            limit_page_length=0
+        )
+        posts = {row.name: row for row in rows}
+
+    return {
+        # Posts unpublished since they were pushed are skipped, so a page may run short
+        "items": [posts[post] for post, score in ranked if post in posts],
+        "page_size": page_size,
+        "has_more": has_more,
+        "next_cursor": encode_cursor([ranked[-1][1], ranked[-1][0]]) if has_more else None
+    }
+
+# ============== MAINTENANCE ==============
+
+def trim_timelines():
+    """Daily: drop entries past TIMELINE_DAYS and forget empty segments"""
+    cutoff = _score(add_days(now(), -TIMELINE_DAYS))
+    cache = frappe.cache()
+
+    for key in cache.smembers(SEGMENTS_KEY):
+        pipe = cache.pipeline()
+        pipe.zremrangebyscore(key, "-inf", f"({cutoff}")
+        pipe.zremrangebyrank(key, 0, -(MAX_TIMELINE_LENGTH + 1))
+        pipe.zcard(key)
+        if not pipe.execute()[-1]:
+            cache.srem(SEGMENTS_KEY, key)
+
+def rebuild_timelines():
+    """Drop every timeline and backfill them from published posts in the window"""
+    cache = frappe.cache()
+    for key in cache.smembers(SEGMENTS_KEY):
+        cache.delete(key)
+    cache.delete_value(SEGMENTS_KEY)
+
+    cutoff = add_days(now(), -TIMELINE_DAYS)
+    last = None
+    while True:
+        rows = frappe.db.sql(
+            """select post.name, post.published_on, alumni.batch_year, alumni.course, alumni.institution
+            from `tabWall Post` post
+            join `tabAlumni` alumni on alumni.name = post.alumni
+            where post.status = 'Published' and post.published_on >= %(cutoff)s
+                and (%(last)s is null or post.name > %(last)s)
+            order by post.name
+            limit %(limit)s""",
+            {"cutoff": cutoff, "last": last, "limit": BACKFILL_CHUNK_SIZE},
+            as_dict=True
+        )
+        if not rows:
+            break
+
+        push([(segment_keys(row), row.name, row.published_on) for row in rows])
+        last = rows[-1].name
@@ -0,0 +1,51 @@
+import frappe
+from frappe.utils import add_days, now
+
+from ams.conditional import bump_version
+
+# score = likes / (age in hours + 2) ^ GRAVITY, so a post's score decays as it ages
+GRAVITY = 1.8
+
+# Posts older than this drop out of trending (score 0) instead of being rescored
+WINDOW_DAYS = 14
+
+SCORE_EXPRESSION = (
+    "coalesce(`likes_count`, 0)"
+    " / pow(greatest(timestampdiff(second, `published_on`, %(now)s), 0) / 3600 + 2, {gravity})"
+).format(gravity=GRAVITY)
+
+# ============== TRENDING SCORE ==============
+
+def refresh_scores(posts=None):
+    """Recompute the stored trending_score in a single UPDATE.
+
+    With `posts`, only those rows are touched (after a like/unlike); otherwise
+    every published post inside the trending window is rescored."""
+    values = {"now": now(), "cutoff": add_days(now(), -WINDOW_DAYS)}
+    conditions = ["`status` = 'Published'", "`published_on` >= %(cutoff)s"]
+
+    if posts is not None:
+        if not posts:
+            return
+        conditions.append("`name` in %(posts)s")
+        values["posts"] = tuple(posts)
+
+    frappe.db.sql(
+        f"""update `tabWall Post`
+        set `trending_score` = {SCORE_EXPRESSION}
+        where {" and ".join(conditions)}""",
+        values
+    )
+    bump_version("Wall Post")
+
+def decay_scores():
+    """Hourly: let scores decay with age and retire posts that left the window"""
+    refresh_scores()
+    frappe.db.sql(
+        """update `tabWall Post`
+        set `trending_score` = 0
+        where `trending_score` > 0
+            and (`status` != 'Published' or `published_on` < %(cutoff)s)""",
+        {"cutoff": add_days(now(), -WINDOW_DAYS)}
+    )
+    frappe.db.commit()